@@ -0,0 +1,151 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+
+ACCOUNTS_DB_PATH = os.getenv("ACCOUNTS_DB_PATH", os.path.join(".cache", "accounts.sqlite3"))
+GUEST_RESUME_LIMIT = 10
+# Plans missing from this table are unlimited.
+PLAN_RESUME_LIMITS = {"free_recruiter": 10, "basic": 100}
+
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def hash_password(password):
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, stored):
+    try:
+        _, n, r, p, salt, expected = stored.split("$")
+        digest = hashlib.scrypt(password.encode("utf-8"), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def resume_limit(plan):
+    return PLAN_RESUME_LIMITS.get(plan)
+
+
+# Accounts, usage quotas and analysis history shared by every app process through one SQLite file (WAL mode).
+# Quota changes are single conditional UPDATEs, so replicas never oversell a plan. A server database can replace
+# this class by providing the same methods.
+class AccountStore:
+    def __init__(self, path=ACCOUNTS_DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY, email TEXT NOT NULL, password_hash TEXT NOT NULL, plan TEXT,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS usage (owner TEXT PRIMARY KEY, resumes_analyzed INTEGER NOT NULL DEFAULT 0);
+            CREATE TABLE IF NOT EXISTS reservations (
+                job_id TEXT PRIMARY KEY, owner TEXT NOT NULL, reserved INTEGER NOT NULL, used INTEGER, settled_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS analyses (
+                owner TEXT NOT NULL, job_id TEXT NOT NULL, jd_digest TEXT NOT NULL, resume_hash TEXT NOT NULL,
+                resume_name TEXT NOT NULL, match REAL NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL,
+                PRIMARY KEY (job_id, resume_hash)
+            );
+            CREATE INDEX IF NOT EXISTS analyses_owner ON analyses (owner, created_at);
+            CREATE INDEX IF NOT EXISTS analyses_jd ON analyses (jd_digest, match);
+            CREATE INDEX IF NOT EXISTS analyses_resume ON analyses (resume_hash);
+        """)
+        self.conn.commit()
+
+    def create_user(self, username, email, password, plan=None):
+        # Returns False if the username is taken.
+        try:
+            with self.lock, self.conn:
+                self.conn.execute(
+                    "INSERT INTO users (username, email, password_hash, plan, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (username, email, hash_password(password), plan, time.time()),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def authenticate(self, username, password):
+        with self.lock:
+            row = self.conn.execute("SELECT password_hash FROM users WHERE username = ?", (username,)).fetchone()
+        return row is not None and verify_password(password, row["password_hash"])
+
+    def get_user(self, username):
+        with self.lock:
+            row = self.conn.execute("SELECT username, email, plan FROM users WHERE username = ?", (username,)).fetchone()
+        return dict(row) if row else None
+
+    def set_plan(self, username, plan):
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE users SET plan = ? WHERE username = ?", (plan, username))
+
+    def usage(self, owner):
+        with self.lock:
+            row = self.conn.execute("SELECT resumes_analyzed FROM usage WHERE owner = ?", (owner,)).fetchone()
+        return row[0] if row else 0
+
+    def reserve(self, owner, job_id, count, limit=None):
+        # Holds `count` resumes of the owner's quota for a job; False (and nothing held) if that would pass `limit`.
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO usage (owner) VALUES (?)", (owner,))
+            updated = self.conn.execute(
+                "UPDATE usage SET resumes_analyzed = resumes_analyzed + ? "
+                "WHERE owner = ? AND (? IS NULL OR resumes_analyzed + ? <= ?)",
+                (count, owner, limit, count, limit),
+            ).rowcount
+            if updated:
+                self.conn.execute("INSERT INTO reservations (job_id, owner, reserved) VALUES (?, ?, ?)", (job_id, owner, count))
+        return bool(updated)
+
+    def settle(self, job_id, used):
+        # Charges only the resumes actually matched and gives the rest of the reservation back; idempotent per job.
+        with self.lock, self.conn:
+            self._settle(job_id, used)
+
+    def _settle(self, job_id, used):
+        row = self.conn.execute(
+            "UPDATE reservations SET used = ?, settled_at = ? WHERE job_id = ? AND settled_at IS NULL RETURNING owner, reserved",
+            (used, time.time(), job_id),
+        ).fetchone()
+        if row:
+            self.conn.execute(
+                "UPDATE usage SET resumes_analyzed = resumes_analyzed - ? WHERE owner = ?", (row["reserved"] - used, row["owner"])
+            )
+
+    def finish_analysis(self, owner, job_id, jd_digest, scored):
+        # scored: (resume hash, resume name, ScreeningResult) for every matched resume. Records the history and
+        # settles the job's reservation in one transaction.
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analyses (owner, job_id, jd_digest, resume_hash, resume_name, match, response, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(owner, job_id, jd_digest, resume_hash, name, result.match, json.dumps(result.to_response()), now)
+                 for resume_hash, name, result in scored],
+            )
+            self._settle(job_id, len(scored))
+
+    def history(self, owner=None, jd_digest=None, resume_hash=None, limit=50):
+        # Past scores, best match first, filtered by any combination of owner, JD and resume.
+        filters = [(column, value) for column, value in (("owner", owner), ("jd_digest", jd_digest), ("resume_hash", resume_hash)) if value]
+        where = " AND ".join(f"{column} = ?" for column, _ in filters) or "1"
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT owner, job_id, jd_digest, resume_hash, resume_name, match, response, created_at FROM analyses "
+                f"WHERE {where} ORDER BY match DESC, created_at DESC LIMIT ?", (*(value for _, value in filters), limit),
+            ).fetchall()
+        return [dict(row, response=json.loads(row["response"])) for row in rows]
@@ -1,64 +1,79 @@
 import streamlit as st
-import PyPDF2
-from docx import Document
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents import set_tracing_disabled
-from openai.types.responses import ResponseTextDeltaEvent
-import asyncio
-import json
-import re
 import os
+import time
+import uuid
 import pandas as pd
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+# The pipeline modules read their settings from the environment at import time.
 load_dotenv()
+from llm import RESUMES_PER_REQUEST, build_agent
+from cache import ResultCache
+from extraction import ExtractionPool
+from ranking import PRERANK_TOP_K, Leaderboard
+from dedup import DuplicateIndex
+from pipeline import DUPLICATE, EXTRACTION_FAILED, MISSING_MUST_HAVE, MODEL_FAILED, NOT_SHORTLISTED, SCORED, rank_key
+from jobs import FAILED, QUEUED, RUNNING, JobManager
+from jd import prepare_jd
+from accounts import GUEST_RESUME_LIMIT, AccountStore, resume_limit
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
 
-st.set_page_config(page_title="CV Ranker - Recruiter")
-
-if 'USERS' not in st.session_state:
-    st.session_state.USERS = {"admin": {"password": "password123", "email": "admin@example.com", "plan": None}}
-if 'logged_in_user' not in st.session_state:
-    st.session_state.logged_in_user = None
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = "login_signup"
-if 'unregistered_recruiter_cv_count' not in st.session_state:
-    st.session_state.unregistered_recruiter_cv_count = 0
-if 'processed_resume_names' not in st.session_state:
-    st.session_state.processed_resume_names = set()
-
-if st.session_state.logged_in_user and st.session_state.logged_in_user != "recruiter_temp":
-    if f"{st.session_state.logged_in_user}_recruiter_resumes_analyzed" not in st.session_state:
-        st.session_state[f"{st.session_state.logged_in_user}_recruiter_resumes_analyzed"] = 0
-    if f"{st.session_state.logged_in_user}_cooldown_end_time" not in st.session_state:
-        st.session_state[f"{st.session_state.logged_in_user}_cooldown_end_time"] = None
-
-
-def input_text(uploaded_file):
-    file_name = uploaded_file.name.lower()
-    text = ""
-    try:
-        if file_name.endswith(".pdf"):
-            reader = PyPDF2.PdfReader(uploaded_file)
-            text = "".join(page.extract_text() for page in reader.pages)
-        elif file_name.endswith((".doc", ".docx")):
-            doc = Document(uploaded_file)
-            text = "\n".join([para.text for para in doc.paragraphs])
-    except Exception as e:
-        st.error(f"Error extracting text from {uploaded_file.name}: {str(e)}")
-        return ""
-    return text
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+
+@st.cache_resource
+def get_extraction_pool():
+    return ExtractionPool()
+
+
+@st.cache_resource
+def get_duplicate_index():
+    return DuplicateIndex()
+
+
+@st.cache_resource
+def get_model_agent():
+    # One process-wide client, so every submission reuses the same pooled keep-alive connections.
+    return build_agent(GEMINI_API_KEY) if GEMINI_API_KEY else None
+
+
+@st.cache_resource
+def get_account_store():
+    store = AccountStore()
+    if store.get_user("admin") is None:
+        store.create_user("admin", "admin@example.com", "password123")
+    return store
+
+
+@st.cache_resource
+def get_job_manager():
+    return JobManager(agent=get_model_agent(), result_cache=get_result_cache(), extraction_pool=get_extraction_pool(),
+                      duplicate_index=get_duplicate_index(), account_store=get_account_store())
+
+
+def guest_owner():
+    # Guests have no account, so their quota and jobs belong to this browser session.
+    return f"guest:{st.session_state.guest_id}"
+
+
+def current_owner():
+    logged_in_user = st.session_state.logged_in_user
+    return guest_owner() if logged_in_user == "recruiter_temp" else logged_in_user
+
+
+def current_plan():
+    user = get_account_store().get_user(st.session_state.logged_in_user)
+    return user["plan"] if user else None
+
+
+def guest_remaining():
+    return GUEST_RESUME_LIMIT - get_account_store().usage(guest_owner())
 
-def extract_json_from_response(response_text):
-    try:
-        return json.loads(response_text)
-    except json.JSONDecodeError:
-        try:
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            return json.loads(json_match.group()) if json_match else None
-        except:
-            return None
 
 def display_recruiter_results(data):
     st.subheader("Analysis Results")
@@ -94,7 +109,7 @@ def display_recruiter_pricing_plans():
         st.markdown("- Upgrade for More Resumes")
         if st.button("Select Free Recruiter Plan", key="recruiter_free_plan"):
             if st.session_state.logged_in_user and st.session_state.logged_in_user != "recruiter_temp":
-                st.session_state.USERS[st.session_state.logged_in_user]["plan"] = "free_recruiter"
+                get_account_store().set_plan(st.session_state.logged_in_user, "free_recruiter")
                 st.session_state.current_page = "recruiter_dashboard"
                 st.rerun()
             else:
@@ -134,142 +149,187 @@ def display_recruiter_pricing_plans():
                 unsafe_allow_html=True
             )
 
-async def analyze_resume_recruiter(upload_files, jd, must_have_keywords, good_to_have_keywords, top_n):
+def submit_analysis(upload_files, jd, must_have_keywords, good_to_have_keywords, prerank_top_k=PRERANK_TOP_K, local_only=False,
+                    resumes_per_request=RESUMES_PER_REQUEST):
     try:
-        logged_in_user = st.session_state.logged_in_user
-        is_temp_recruiter = logged_in_user == "recruiter_temp"
-
-        if is_temp_recruiter:
-            remaining_cvs = 10 - st.session_state.unregistered_recruiter_cv_count
-            if len(upload_files) > remaining_cvs:
-                st.error(f"You can only analyze {remaining_cvs} more CVs without signing up. Please sign up to continue.")
-                return
-
-        file_names = [file.name for file in upload_files]
-        duplicate_files = set([name for name in file_names if file_names.count(name) > 1])
-        if duplicate_files:
-            st.error(f"Duplicate files found: {', '.join(duplicate_files)}. Please remove duplicates and try again.")
-            return
+        is_temp_recruiter = st.session_state.logged_in_user == "recruiter_temp"
 
-        provider = AsyncOpenAI(
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-            api_key=GEMINI_API_KEY
-        )
-        model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=provider)
-        set_tracing_disabled(disabled=True)
-
-        agent = Agent(
-            name="ATS Agent",
-            instructions="""
-            You are a skilled ATS system. You are an experienced Resume analyzer who's has 40 years experience in every tech field. Use your experience and analyze the resume against the job description carefully and provide:
-            - Percentage match (e.g., "75%")
-            - Missing keywords
-            - Matching keywords (keywords from the job description that are present in the resume)
-            - Profile summary
-            - Candidate's total years of experience
-            - Key skill strengths
-            Return ONLY valid JSON format: {
-                "##JD Match": "X%",
-                "##Missing Keywords": [],
-                "##Matching Keywords": [],
-                "##Profile Summary": "...",
-                "##Years of Experience": "Y years",
-                "##Key Skill Strengths": ["skill1", "skill2"]
-            }
-            Keep your response short and complete you response within 100 words. Just be honest about your response because it is the question of company's policy and future i will tip you 20000 dollars for best satisfying responses.
-            """,
-            model=model,
-        )
         if not upload_files:
             st.error("Please upload at least one resume")
             return
-        must_have_list = [kw.strip() for kw in must_have_keywords.split(",")] if must_have_keywords else []
-        good_to_have_list = [kw.strip() for kw in good_to_have_keywords.split(",")] if good_to_have_keywords else []
-        results = []
-        comparison_data = []
 
-        resume_count = len(upload_files)
-        if not is_temp_recruiter:
-            plan = st.session_state.USERS.get(logged_in_user, {}).get("plan")
-            limit = 10 if plan == "free_recruiter" else 100 if plan == "basic" else float('inf')
-            if plan in ["free_recruiter", "basic"] and st.session_state[f"{logged_in_user}_recruiter_resumes_analyzed"] + resume_count > limit:
+        # The whole upload is reserved against the quota up front, atomically, so concurrent submissions from other
+        # tabs or app replicas cannot overshoot it; the finished job only charges the resumes that matched.
+        account_store = get_account_store()
+        owner = current_owner()
+        limit = GUEST_RESUME_LIMIT if is_temp_recruiter else resume_limit(current_plan())
+        job_id = uuid.uuid4().hex
+        if not account_store.reserve(owner, job_id, len(upload_files), limit):
+            if is_temp_recruiter:
+                st.error(f"You can only analyze {guest_remaining()} more CVs without signing up. Please sign up to continue.")
+            else:
                 st.warning(f"You have reached the {limit} resume limit on your current plan. Please upgrade to continue.")
-                return
-
-        batch_size = 10
-        for batch_idx in range(0, len(upload_files), batch_size):
-            batch = upload_files[batch_idx:batch_idx + batch_size]
-            st.write(f"Processing batch {batch_idx // batch_size + 1} of {len(upload_files) // batch_size + 1}")
-            for idx, upload_file in enumerate(batch, batch_idx + 1):
-                st.subheader(f"Analysis for Resume {idx}: {upload_file.name}")
-                text = input_text(upload_file)
-                if not text:
-                    continue
-                resume_input = f"Evaluate resume:\n{text}\n\nJob Description:\n{jd}"
-                try:
-                    result = Runner.run_streamed(starting_agent=agent, input=resume_input)
-                    full_response = ""
-                    async for event in result.stream_events():
-                        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
-                            full_response += event.data.delta
-                    response_json = extract_json_from_response(full_response)
-                    if response_json:
-                        resume_text = text.lower()
-                        has_must_have = all(keyword.lower() in resume_text for keyword in must_have_list) if must_have_list else True
-
-                        if has_must_have:
-                            has_good_to_have = any(keyword.lower() in resume_text for keyword in good_to_have_list) if good_to_have_list else True
-                            if has_good_to_have: 
-                                response_json["resume_index"] = idx
-                                response_json["resume_name"] = upload_file.name
-                                results.append(response_json)
-
-                                experience = response_json.get("##Years of Experience", "N/A")
-                                skills = ", ".join(response_json.get("##Key Skill Strengths", []))
-                                percentage = response_json.get("##JD Match", "N/A")
-                                comparison_data.append({
-                                    "Resume Name": upload_file.name,
-                                    "Years of Experience": experience,
-                                    "Skill Set": skills,
-                                    "Match Score": percentage
-                                })
-                        else:
-                            st.warning(f"Resume '{upload_file.name}' skipped: Missing required keywords.")
-
-
-                except Exception as e:
-                    st.error(f"Error analyzing resume {idx}: {str(e)}. Skipping this resume.")
-        if not results:
+            return
+
+        try:
+            st.session_state.active_job_id = get_job_manager().submit(
+                owner,
+                [(upload_file.name, upload_file.getvalue()) for upload_file in upload_files],
+                jd, job_id=job_id, must_have_keywords=must_have_keywords, good_to_have_keywords=good_to_have_keywords,
+                prerank_top_k=prerank_top_k, local_only=local_only, resumes_per_request=resumes_per_request,
+            )
+        except Exception:
+            account_store.settle(job_id, 0)
+            raise
+    except Exception as e:
+        st.error(f"Server error: {str(e)}. Please try again later.")
+
+
+def display_leaderboard(outcomes, top_n):
+    leaderboard = Leaderboard(top_n, key=rank_key)
+    for outcome in outcomes:
+        if outcome.status == SCORED:
+            leaderboard.push(outcome)
+    if leaders := leaderboard.top():
+        st.dataframe(pd.DataFrame([{
+            "Rank": rank,
+            "Resume Name": leader.name,
+            "Match Score": leader.response.get("##JD Match", "N/A"),
+            "Years of Experience": leader.response.get("##Years of Experience", "N/A"),
+        } for rank, leader in enumerate(leaders, 1)]), hide_index=True)
+    return leaders
+
+
+def display_outcome_log(outcomes):
+    with st.expander("Per-resume status", expanded=False):
+        for outcome in outcomes:
+            if not outcome.status:
+                continue
+            st.markdown(f"**Resume {outcome.index}: {outcome.name}**")
+            if outcome.status == EXTRACTION_FAILED:
+                st.error(f"Error extracting text from {outcome.name}: {outcome.error}")
+            elif outcome.status == MISSING_MUST_HAVE:
+                st.warning(f"Resume '{outcome.name}' skipped: Missing required keywords.")
+            elif outcome.status == DUPLICATE:
+                st.info(f"Resume '{outcome.name}' skipped: {outcome.error or 'duplicate'}.")
+            elif outcome.status == NOT_SHORTLISTED:
+                st.caption(f"Not shortlisted by local pre-ranking ({outcome.error})." if outcome.error else "Not shortlisted by local pre-ranking.")
+            elif outcome.status == MODEL_FAILED:
+                st.error(f"Error analyzing resume {outcome.index}: {outcome.error}. Skipping this resume.")
+            elif outcome.status == SCORED:
+                st.caption(f"JD Match: {outcome.response.get('##JD Match', 'N/A')}")
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def display_job_progress(job_id, top_n):
+    job_manager = get_job_manager()
+    job = job_manager.get_job(job_id)
+    if job["status"] not in (QUEUED, RUNNING):
+        st.rerun()
+    if job["status"] == QUEUED:
+        st.info("Your analysis is queued and will start as soon as a worker is free.")
+    completed, total = job["completed"], job["total"]
+    elapsed = time.time() - (job["started_at"] or job["created_at"])
+    eta = f" · ETA {elapsed / completed * (total - completed):.0f}s" if completed else ""
+    st.progress(completed / total, text=f"{completed}/{total} resumes analyzed · {elapsed:.0f}s elapsed{eta}")
+    st.caption("You can keep using the page or come back later; the analysis continues in the background.")
+    outcomes = job_manager.outcomes(job_id)
+    display_leaderboard(outcomes, top_n)
+    display_outcome_log(outcomes)
+
+
+def display_job_results(job, top_n):
+    try:
+        is_temp_recruiter = st.session_state.logged_in_user == "recruiter_temp"
+        if job["status"] == FAILED:
+            st.error(f"Server error: {job['error']}. Please try again later.")
+            return
+
+        summary = job["summary"]
+        elapsed = (job["finished_at"] or time.time()) - (job["started_at"] or job["created_at"])
+        st.progress(1.0, text=f"{job['total']}/{job['total']} resumes analyzed in {elapsed:.0f}s")
+        if summary.get("local_only"):
+            st.caption(f"Local-only mode: ranked {summary.get('candidate_count', 0)} resumes without any model calls")
+        elif job["options"].get("prerank_top_k"):
+            st.info(f"Only the top {summary.get('shortlisted_count', 0)} of {summary.get('candidate_count', 0)} resumes by local "
+                    f"keyword relevance were scored by the AI; the rest are listed as not shortlisted")
+        st.caption(f"Keyword pre-filter skipped {summary.get('filtered_count', 0)} resumes before any model call")
+        st.caption(f"Result cache: {summary.get('cache_hits', 0)} hits, {summary.get('cache_misses', 0)} misses")
+        if summary.get("duplicate_count") or summary.get("reused_count"):
+            st.caption(f"Duplicates: {summary.get('duplicate_count', 0)} skipped within this upload, "
+                       f"{summary.get('reused_count', 0)} matched resumes already scored for this job description")
+
+        outcomes = get_job_manager().outcomes(job["id"])
+        leaders = display_leaderboard(outcomes, top_n)
+        display_outcome_log(outcomes)
+
+        comparison_data = []
+        for outcome in sorted((outcome for outcome in outcomes if outcome.status == SCORED), key=rank_key, reverse=True):
+            response_json = outcome.response
+            experience = response_json.get("##Years of Experience", "N/A")
+            skills = ", ".join(response_json.get("##Key Skill Strengths", []))
+            percentage = response_json.get("##JD Match", "N/A")
+            comparison_data.append({
+                "Resume Name": outcome.name,
+                "Years of Experience": experience,
+                "Skill Set": skills,
+                "Match Score": percentage
+            })
+        results = [dict(outcome.response, resume_index=outcome.index, resume_name=outcome.name) for outcome in leaders]
+        matched_count = len(comparison_data)
+        if not matched_count:
             st.error("No resumes matched the criteria. Please check keywords or upload different resumes.")
         else:
-            if is_temp_recruiter:
-                st.session_state.unregistered_recruiter_cv_count += len(results)
-                remaining_cvs = 10 - st.session_state.unregistered_recruiter_cv_count
-                if remaining_cvs <= 0:
-                    st.warning("You've reached the limit of 10 CV analyses without an account. Please sign up to continue.")
-            else:
-                plan = st.session_state.USERS.get(logged_in_user, {}).get("plan")
-                if plan in ["free_recruiter", "basic"]:
-                    st.session_state[f"{logged_in_user}_recruiter_resumes_analyzed"] += len(results)
-            st.write(f"Total matched resumes: {len(results)}")
-            results.sort(key=lambda x: int(x["##JD Match"].replace("%", "")), reverse=True)
+            if is_temp_recruiter and guest_remaining() <= 0:
+                st.warning("You've reached the limit of 10 CV analyses without an account. Please sign up to continue.")
+            st.write(f"Total matched resumes: {matched_count}")
             st.subheader(f"Top {top_n} Ranked Resumes")
-            for i, result in enumerate(results[:top_n], 1):
+            for i, result in enumerate(results, 1):
                 st.subheader(f"Rank {i}: {result['resume_name']}")
                 display_recruiter_results(result)
-            if len(results) < top_n:
-                st.warning(f"Only {len(results)} resumes matched the criteria, less than the requested top {top_n}.")
+            if matched_count < top_n:
+                st.warning(f"Only {matched_count} resumes matched the criteria, less than the requested top {top_n}.")
 
             if comparison_data:
                 st.subheader("Comparison of Qualified Candidates")
-                df_comparison = pd.DataFrame(comparison_data)
-                df_comparison['Match Score Value'] = df_comparison['Match Score'].str.replace('%', '').astype(int)
-                df_comparison = df_comparison.sort_values(by='Match Score Value', ascending=False).drop(columns=['Match Score Value'])
-                st.dataframe(df_comparison)
+                st.dataframe(pd.DataFrame(comparison_data))
 
     except Exception as e:
         st.error(f"Server error: {str(e)}. Please try again later.")
 
+
+def display_active_job(top_n):
+    job_id = st.session_state.get("active_job_id")
+    if not job_id:
+        return
+    job = get_job_manager().get_job(job_id)
+    if job is None:
+        st.session_state.active_job_id = None
+        return
+    st.subheader("Screening in Progress" if job["status"] in (QUEUED, RUNNING) else "Screening Results")
+    if job["status"] in (QUEUED, RUNNING):
+        display_job_progress(job_id, top_n)
+    else:
+        display_job_results(job, top_n)
+
+
+def init_session():
+    if 'logged_in_user' not in st.session_state:
+        st.session_state.logged_in_user = None
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = "login_signup"
+    if 'guest_id' not in st.session_state:
+        st.session_state.guest_id = uuid.uuid4().hex
+    if 'processed_resume_names' not in st.session_state:
+        st.session_state.processed_resume_names = set()
+    if 'active_job_id' not in st.session_state:
+        st.session_state.active_job_id = None
+
+    if st.session_state.logged_in_user and st.session_state.logged_in_user != "recruiter_temp":
+        if f"{st.session_state.logged_in_user}_cooldown_end_time" not in st.session_state:
+            st.session_state[f"{st.session_state.logged_in_user}_cooldown_end_time"] = None
+
+
 def recruiter_app():
     if st.session_state.current_page == "login_signup":
         st.title("CV Ranker - Recruiter Access")
@@ -286,8 +346,8 @@ def recruiter_app():
                 st.rerun()
         st.markdown("---")
         st.subheader("Guest Recruiter Access")
-        st.warning(f"No account needed for first 10 CVs. You can analyze {10 - st.session_state.unregistered_recruiter_cv_count} more CVs before signing up.")
-        if st.session_state.unregistered_recruiter_cv_count >= 10:
+        st.warning(f"No account needed for first {GUEST_RESUME_LIMIT} CVs. You can analyze {guest_remaining()} more CVs before signing up.")
+        if guest_remaining() <= 0:
             st.warning("You've reached the limit of 10 CV analyses without an account. Please sign up to continue.")
             if st.button("Sign Up Now (Guest Limit)", key="signup_now_guest_limit"):
                 st.session_state.current_page = "signup_page"
@@ -308,8 +368,7 @@ def recruiter_app():
         password = st.text_input("Password", type="password", key="signup_password")
         if st.button("Sign Up", key="signup_action_button"):
             if username and email and password:
-                if username not in st.session_state.USERS:
-                    st.session_state.USERS[username] = {"password": password, "email": email, "plan": None}
+                if get_account_store().create_user(username, email, password):
                     st.session_state.logged_in_user = username
                     st.session_state.current_page = "recruiter_pricing"
                     st.rerun()
@@ -327,10 +386,8 @@ def recruiter_app():
         username = st.text_input("Username", key="login_username")
         password = st.text_input("Password", type="password", key="login_password")
         if st.button("Login", key="login_action_button"):
-            if username in st.session_state.USERS and st.session_state.USERS[username]["password"] == password:
+            if get_account_store().authenticate(username, password):
                 st.session_state.logged_in_user = username
-                if f"{username}_recruiter_resumes_analyzed" not in st.session_state:
-                    st.session_state[f"{username}_recruiter_resumes_analyzed"] = 0
                 if f"{username}_cooldown_end_time" not in st.session_state:
                     st.session_state[f"{username}_cooldown_end_time"] = None
                 st.session_state.current_page = "recruiter_pricing"
@@ -374,27 +431,28 @@ def recruiter_app():
         must_have_keywords = st.text_area("Enter must-have keywords (comma-separated)", help="e.g., Python, SQL, 5 years")
         good_to_have_keywords = st.text_area("Enter good-to-have keywords (comma-separated)", help="e.g., JavaScript, Cloud")
         jd = st.text_area("Paste job description", height=200)
+        prerank_top_k = st.number_input("Shortlist top K resumes for AI scoring (0 = score all)", min_value=0, value=PRERANK_TOP_K,
+                                        help="Resumes are pre-ranked locally against the job description and only the top K are sent to the AI; "
+                                             "AI scoring then waits until every upload has been parsed")
+        local_only = st.checkbox("Local-only ranking (no AI calls)", help="Rank by keyword relevance only, e.g. when the AI service is unavailable")
+        resumes_per_request = st.number_input("Resumes per AI request", min_value=1, max_value=10, value=RESUMES_PER_REQUEST,
+                                              help="Pack several resumes into one AI request to save tokens on large uploads")
         upload_files = st.file_uploader("Upload your resume(s)", type=["pdf", "doc", "docx"],
                                         help="Please upload one or more PDF, MS Word (.doc, .docx) files",
                                         accept_multiple_files=True)
         is_temp_recruiter = logged_in_user == "recruiter_temp"
 
         if is_temp_recruiter:
-            remaining_cvs = 10 - st.session_state.unregistered_recruiter_cv_count
-            st.warning(f"Analyze {remaining_cvs} more CVs for free. To remove limits and access premium features, please sign up.")
+            st.warning(f"Analyze {guest_remaining()} more CVs for free. To remove limits and access premium features, please sign up.")
             if st.button("Sign Up Now", key="dashboard_signup_now"):
                 st.session_state.current_page = "signup_page"
                 st.rerun()
         else:
             st.write(f"Welcome, {logged_in_user}!")
-            user_plan = st.session_state.USERS.get(logged_in_user, {}).get("plan", "Unknown")
-            if user_plan == "free_recruiter":
-                limit = 10
-                current_count = st.session_state.get(f"{logged_in_user}_recruiter_resumes_analyzed", 0)
-                st.info(f"Your current plan: {user_plan}. You have analyzed {current_count} resumes. Limit: {limit}.")
-            elif user_plan == "basic":
-                limit = 100
-                current_count = st.session_state.get(f"{logged_in_user}_recruiter_resumes_analyzed", 0)
+            user_plan = current_plan() or "Unknown"
+            if user_plan in ("free_recruiter", "basic"):
+                limit = resume_limit(user_plan)
+                current_count = get_account_store().usage(logged_in_user)
                 st.info(f"Your current plan: {user_plan}. You have analyzed {current_count} resumes. Limit: {limit}.")
             elif user_plan == "premium":
                 st.info(f"Your current plan: {user_plan}. You have unlimited analyses.")
@@ -408,7 +466,26 @@ def recruiter_app():
             if not jd.strip():
                 st.error("Please provide a job description to analyze the resumes.")
             else:
-                asyncio.run(analyze_resume_recruiter(upload_files, jd, must_have_keywords, good_to_have_keywords, top_n))
+                submit_analysis(upload_files, jd, must_have_keywords, good_to_have_keywords, prerank_top_k, local_only, resumes_per_request)
+
+        if logged_in_user and jd.strip() and (past_rankings := get_account_store().history(owner=current_owner(), jd_digest=prepare_jd(jd).digest, limit=top_n)):
+            with st.expander("Previous rankings for this job description", expanded=False):
+                st.dataframe(pd.DataFrame([{
+                    "Resume Name": past["resume_name"],
+                    "Match Score": past["response"].get("##JD Match", "N/A"),
+                    "Years of Experience": past["response"].get("##Years of Experience", "N/A"),
+                    "Analyzed": f"{datetime.fromtimestamp(past['created_at']):%Y-%m-%d %H:%M}",
+                } for past in past_rankings]), hide_index=True)
+
+        if logged_in_user and (recent_jobs := get_job_manager().list_jobs(current_owner())):
+            job_labels = {job["id"]: f"{datetime.fromtimestamp(job['created_at']):%Y-%m-%d %H:%M} · {job['total']} resumes · {job['status']}" for job in recent_jobs}
+            selected_job_id = st.selectbox("Recent analyses", list(job_labels), format_func=job_labels.get,
+                                           index=list(job_labels).index(st.session_state.active_job_id) if st.session_state.get("active_job_id") in job_labels else 0)
+            if st.button("Open analysis", key="open_recent_job") and selected_job_id != st.session_state.get("active_job_id"):
+                st.session_state.active_job_id = selected_job_id
+                st.rerun()
+
+        display_active_job(top_n)
 
         if st.button("Back to Pricing/Logout", key="dashboard_back_to_pricing"):
             st.session_state.current_page = "recruiter_pricing"
@@ -419,5 +496,8 @@ def recruiter_app():
             st.rerun()
 
 
+# Extraction workers import the app script as __mp_main__; only a real Streamlit run builds the page.
 if __name__ == "__main__":
+    st.set_page_config(page_title="CV Ranker - Recruiter")
+    init_session()
     recruiter_app()
@@ -0,0 +1,41 @@
+import argparse
+import asyncio
+import time
+
+from llm import build_agent, build_rate_limiter, run_agent
+from benchmarks.mock_server import start_mock_server
+
+RESUME_INPUT = "Evaluate resume:\nPython developer, 5 years, SQL, AWS\n\nJob Description:\nBackend engineer (Python, SQL)"
+
+
+async def score_all(base_url, count, concurrency):
+    # A fresh agent per run: its pooled HTTP client is bound to the event loop it was first used on.
+    agent = build_agent("mock-key", base_url=base_url, model_name="mock-model")
+    semaphore = asyncio.Semaphore(concurrency)
+    rate_limiter = build_rate_limiter(requests_per_minute=60_000, burst=concurrency)
+    responses = await asyncio.gather(*(run_agent(agent, RESUME_INPUT, semaphore, rate_limiter) for _ in range(count)))
+    assert len(responses) == count and all(responses)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs concurrent scoring against a local mock model server")
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(latency=args.latency)
+    try:
+        timings = {}
+        for concurrency in (1, args.concurrency):
+            started = time.perf_counter()
+            asyncio.run(score_all(base_url, args.resumes, concurrency))
+            timings[concurrency] = time.perf_counter() - started
+            print(f"concurrency={concurrency:<3} resumes={args.resumes} wall={timings[concurrency]:.2f}s")
+        print(f"speedup: {timings[1] / timings[args.concurrency]:.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
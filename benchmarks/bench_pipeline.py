@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from llm import build_agent
+from cache import ResultCache
+from dedup import DuplicateIndex
+from extraction import ExtractionPool
+from pipeline import analyze_resumes
+from condense import RESUME_TOKEN_BUDGET
+from cli import load_resumes, result_rows
+from benchmarks.corpus import generate_corpus
+from benchmarks.mock_server import start_mock_server
+
+STAGES = ("extract_wait", "extract", "filter", "dedupe", "condense", "model_wait", "model", "parse")
+
+
+def render(run):
+    # Stand-in for the dashboard's table rendering: build the ranked rows and the comparison DataFrame.
+    rows = list(result_rows(run))
+    pd.DataFrame(rows).sort_values(by="rank")
+    return rows
+
+
+def stage_report(run, render_seconds):
+    lines = [f"{'stage':<12} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'total s':>9}"]
+    for stage in STAGES:
+        samples = np.array([outcome.timings[stage] for outcome in run.outcomes if stage in outcome.timings])
+        if samples.size:
+            p50, p95 = np.percentile(samples, [50, 95]) * 1000
+            lines.append(f"{stage:<12} {samples.size:>5} {p50:>9.1f} {p95:>9.1f} {samples.sum():>9.2f}")
+    for stage, seconds in (("rank", run.timings.get("rank")), ("render", render_seconds)):
+        if seconds is not None:
+            lines.append(f"{stage:<12} {1:>5} {seconds * 1000:>9.1f} {seconds * 1000:>9.1f} {seconds:>9.2f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark against a mock model server")
+    parser.add_argument("--resumes", type=int, default=100)
+    parser.add_argument("--sizes", default="1,2,5,20", help="comma-separated page counts to cycle through")
+    parser.add_argument("--corpus-dir", help="reuse or create the synthetic corpus here instead of a temp dir")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--chunk-size", type=int, default=16)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--top-k", type=int, default=0)
+    parser.add_argument("--resumes-per-request", type=int, default=1)
+    parser.add_argument("--resume-token-budget", type=int, default=RESUME_TOKEN_BUDGET)
+    parser.add_argument("--must-have", default="")
+    parser.add_argument("--trace-memory", action="store_true", help="report peak Python heap via tracemalloc (slows the run)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        corpus_dir = args.corpus_dir or os.path.join(workdir, "corpus")
+        if not os.path.isdir(corpus_dir) or not load_resumes(corpus_dir):
+            generate_corpus(corpus_dir, args.resumes, tuple(int(size) for size in args.sizes.split(",")))
+        resumes = load_resumes(corpus_dir)[:args.resumes]
+        with open(os.path.join(corpus_dir, "jd.txt"), encoding="utf-8") as f:
+            jd = f.read()
+
+        server, base_url = start_mock_server(args.latency, jitter=args.jitter, error_rate=args.error_rate, chunk_size=args.chunk_size)
+        extraction_pool = ExtractionPool()
+        try:
+            if args.trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            run = asyncio.run(analyze_resumes(
+                resumes, jd, args.must_have, prerank_top_k=args.top_k,
+                agent=build_agent("mock-key", base_url=base_url, model_name="mock-model"),
+                result_cache=ResultCache(os.path.join(workdir, "results.sqlite3")), extraction_pool=extraction_pool,
+                duplicate_index=DuplicateIndex(os.path.join(workdir, "duplicates.sqlite3")),
+                max_concurrent=args.concurrency, requests_per_minute=60_000, resumes_per_request=args.resumes_per_request,
+                resume_token_budget=args.resume_token_budget,
+            ))
+            render_started = time.perf_counter()
+            render(run)
+            finished = time.perf_counter()
+            peak_heap = tracemalloc.get_traced_memory()[1] if args.trace_memory else None
+            tracemalloc.stop()
+        finally:
+            extraction_pool.shutdown()
+            server.shutdown()
+
+    statuses = pd.Series([outcome.status for outcome in run.outcomes]).value_counts().to_dict()
+    print(f"resumes={len(resumes)} concurrency={args.concurrency} latency={args.latency}s error_rate={args.error_rate}")
+    print(f"statuses: {statuses}")
+    print(stage_report(run, finished - render_started))
+    print(f"wall: {finished - started:.2f}s  throughput: {len(resumes) / (finished - started):.1f} resumes/s")
+    print(f"model server connections opened: {server.connections}")
+    print(f"resume tokens: {run.resume_tokens} extracted -> {run.prompt_tokens} sent in prompts")
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    heap = f"  peak python heap: {peak_heap / 2**20:.1f} MiB" if peak_heap is not None else ""
+    print(f"peak RSS: {peak_rss:.1f} MiB{heap}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import os
+import random
+
+from docx import Document
+
+SKILLS = [
+    "Python", "SQL", "AWS", "Docker", "Kubernetes", "Java", "Spring", "React", "TypeScript", "Go", "Terraform",
+    "PostgreSQL", "Kafka", "Spark", "Airflow", "Django", "FastAPI", "GCP", "Azure", "Redis", "GraphQL", "C++",
+]
+TITLES = ["Backend Engineer", "Data Engineer", "Full Stack Developer", "Platform Engineer", "ML Engineer", "SRE"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+VERBS = ["Built", "Designed", "Migrated", "Optimized", "Led", "Maintained", "Automated", "Scaled"]
+OBJECTS = ["billing pipeline", "REST APIs", "data warehouse", "CI/CD", "search service", "ETL jobs", "dashboards"]
+LINES_PER_PAGE = 45
+SIZES = (1, 2, 5, 20)
+
+JD_TEXT = """Senior Backend Engineer
+We are looking for a backend engineer with 5+ years of experience building services in Python and SQL.
+Must have: Python, SQL, AWS. Nice to have: Docker, Kubernetes, Kafka, Terraform.
+You will design REST APIs, own data pipelines and improve reliability of our platform."""
+
+
+def resume_lines(rng, index, pages):
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    lines = [
+        f"Candidate {index}",
+        f"{rng.choice(TITLES)} - {rng.randint(1, 15)} years of experience",
+        "Skills: " + ", ".join(skills),
+        "Experience",
+    ]
+    while len(lines) < pages * LINES_PER_PAGE:
+        if rng.random() < 0.15:
+            lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2005, 2024)})")
+        lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)} and {rng.choice(skills)}")
+    return lines
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, lines):
+    # Hand-rolled single-font PDF so the corpus needs nothing beyond the app's own dependencies.
+    pages = [lines[i:i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 14 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def write_docx(path, lines):
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def generate_corpus(output_dir, count, sizes=SIZES, seed=0):
+    # Writes `count` synthetic resumes (alternating PDF/DOCX, cycling through `sizes` pages) plus jd.txt.
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for index in range(count):
+        lines = resume_lines(rng, index, sizes[index % len(sizes)])
+        extension = "pdf" if index % 2 == 0 else "docx"
+        path = os.path.join(output_dir, f"resume_{index:04d}.{extension}")
+        (write_pdf if extension == "pdf" else write_docx)(path, lines)
+        paths.append(path)
+    with open(os.path.join(output_dir, "jd.txt"), "w", encoding="utf-8") as f:
+        f.write(JD_TEXT)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic PDF/DOCX resume corpus")
+    parser.add_argument("output_dir")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated page counts to cycle through")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = generate_corpus(args.output_dir, args.count, tuple(int(size) for size in args.sizes.split(",")), args.seed)
+    print(f"Wrote {len(paths)} resumes and jd.txt to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_RESPONSE = {
+    "##JD Match": "75%",
+    "##Missing Keywords": ["Kubernetes"],
+    "##Matching Keywords": ["Python", "SQL"],
+    "##Profile Summary": "Backend engineer with data platform experience.",
+    "##Years of Experience": "5 years",
+    "##Key Skill Strengths": ["Python", "SQL"],
+}
+
+
+def mock_result(resume_text):
+    # Deterministic per-resume score so rankings are stable across runs.
+    match = 40 + int(hashlib.sha256(resume_text.encode("utf-8")).hexdigest(), 16) % 60
+    return dict(MOCK_RESPONSE, **{"##JD Match": f"{match}%"})
+
+
+def mock_content(body):
+    # Packed multi-resume prompts get a JSON array with one result per "### Resume <id>" header.
+    prompt = "\n".join(str(message.get("content", "")) for message in body.get("messages", []) if message.get("role") == "user")
+    sections = re.split(r"^### Resume (\S+)\n", prompt, flags=re.MULTILINE)
+    if len(sections) > 1:
+        results = [dict(mock_result(text), resume_id=resume_id) for resume_id, text in zip(sections[1::2], sections[2::2])]
+        # JSON mode only allows an object at the top level.
+        json_mode = body.get("response_format", {}).get("type") == "json_object"
+        return json.dumps({"results": results} if json_mode else results)
+    return json.dumps(mock_result(prompt))
+
+
+# Minimal OpenAI-compatible /chat/completions endpoint. Each request waits `latency` (+/- `jitter`) seconds,
+# fails with a 429 or 500 with probability `error_rate`, and streams its answer in `chunk_size`-character deltas.
+# Streams use chunked encoding so clients can keep connections alive; `server.connections` counts TCP connections.
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+        if random.random() < server.error_rate:
+            self._send_error(random.choice((429, 500)))
+            return
+        content = mock_content(body)
+        if body.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk_size = server.chunk_size or len(content)
+            for start in range(0, len(content), chunk_size):
+                delta = {"content": content[start:start + chunk_size]}
+                if start == 0:
+                    delta["role"] = "assistant"
+                self._write_event(self._chunk(body, [{"index": 0, "delta": delta, "finish_reason": None}]))
+            self._write_event(self._chunk(body, [{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            self._write_event(self._chunk(body, [], usage=True))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        else:
+            payload = json.dumps({
+                "id": "chatcmpl-mock",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "mock"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    def _send_error(self, status):
+        payload = json.dumps({"error": {"message": f"mock error {status}", "type": "mock_error", "code": status}}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "0.1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _chunk(self, body, choices, usage=False):
+        chunk = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": choices,
+        }
+        if usage:
+            chunk["usage"] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        return chunk
+
+    def _write_event(self, chunk):
+        self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(latency=0.5, host="127.0.0.1", port=0, jitter=0.0, error_rate=0.0, chunk_size=0):
+    server = ThreadingHTTPServer((host, port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.chunk_size = chunk_size
+    server.connections = 0
+    server.lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a mock OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before each response starts")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform +/- jitter added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 429/500")
+    parser.add_argument("--chunk-size", type=int, default=0, help="characters per streamed delta (0 = one delta)")
+    args = parser.parse_args()
+    server, base_url = start_mock_server(args.latency, args.host, args.port, args.jitter, args.error_rate, args.chunk_size)
+    print(f"Mock model server listening on {base_url} (set MODEL_BASE_URL to use it)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
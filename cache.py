@@ -0,0 +1,80 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(".cache", "results.sqlite3"))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "10000"))
+
+
+def normalize_jd(jd):
+    return re.sub(r"\s+", " ", jd).strip().lower()
+
+
+def result_cache_key(resume_text, jd, instructions, model_name):
+    digest = hashlib.sha256()
+    for part in (resume_text, normalize_jd(jd), instructions, model_name):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+# Persistent (resume, JD, prompt, model) -> raw model response store with LRU eviction.
+class ResultCache:
+    def __init__(self, path=RESULT_CACHE_PATH, max_entries=RESULT_CACHE_MAX_ENTRIES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        # WAL lets concurrent jobs and worker processes read while another writes.
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, last_accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS results_last_accessed ON results (last_accessed)")
+        self.conn.commit()
+
+    # get and set are best effort: an unreadable cache is a miss and a failed write is skipped, never a failed run.
+    def get(self, key):
+        with self.lock:
+            try:
+                row = self.conn.execute("SELECT response FROM results WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            try:
+                with self.conn:
+                    self.conn.execute("UPDATE results SET last_accessed = ? WHERE key = ?", (time.time(), key))
+            except sqlite3.Error:
+                pass
+            return row[0]
+
+    def set(self, key, response):
+        with self.lock:
+            try:
+                with self.conn:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO results (key, response, last_accessed) VALUES (?, ?, ?)",
+                        (key, response, time.time()),
+                    )
+                    self.conn.execute(
+                        "DELETE FROM results WHERE key IN ("
+                        "SELECT key FROM results ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
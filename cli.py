@@ -0,0 +1,114 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+
+from dotenv import load_dotenv
+
+# The pipeline modules read their settings from the environment at import time.
+load_dotenv()
+from llm import (
+    BATCH_TOKEN_BUDGET, MAX_CONCURRENT_REQUESTS, MODEL_BASE_URL, MODEL_NAME, REQUESTS_PER_MINUTE, RESUMES_PER_REQUEST,
+    build_agent,
+)
+from ranking import PRERANK_TOP_K
+from condense import RESUME_TOKEN_BUDGET
+from pipeline import SCORED, analyze_resumes
+
+RESUME_EXTENSIONS = (".pdf", ".doc", ".docx")
+CSV_FIELDS = ["rank", "resume_name", "status", "jd_match", "years_of_experience", "key_skill_strengths",
+              "matching_keywords", "missing_keywords", "profile_summary", "resume_tokens", "prompt_tokens", "error"]
+
+
+def load_resumes(resume_dir):
+    resumes = []
+    for file_name in sorted(os.listdir(resume_dir)):
+        path = os.path.join(resume_dir, file_name)
+        if os.path.isfile(path) and file_name.lower().endswith(RESUME_EXTENSIONS):
+            with open(path, "rb") as f:
+                resumes.append((file_name, f.read()))
+    return resumes
+
+
+def result_rows(run):
+    ranked = run.ranked()
+    ranked_indexes = {outcome.index for outcome in ranked}
+    unranked = [outcome for outcome in run.outcomes if outcome.index not in ranked_indexes]
+    for rank, outcome in enumerate(ranked + unranked, 1):
+        response = outcome.response or {}
+        yield {
+            "rank": rank if outcome.status == SCORED else None,
+            "resume_name": outcome.name,
+            "status": outcome.status,
+            "jd_match": response.get("##JD Match"),
+            "years_of_experience": response.get("##Years of Experience"),
+            "key_skill_strengths": response.get("##Key Skill Strengths", []),
+            "matching_keywords": response.get("##Matching Keywords", []),
+            "missing_keywords": response.get("##Missing Keywords", []),
+            "profile_summary": response.get("##Profile Summary"),
+            "resume_tokens": outcome.resume_tokens or None,
+            "prompt_tokens": outcome.prompt_tokens or None,
+            "error": outcome.error,
+        }
+
+
+def write_results(rows, output):
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        if output.lower().endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({key: ", ".join(value) if isinstance(value, list) else value for key, value in row.items()})
+        else:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of resumes against a job description without the web UI")
+    parser.add_argument("resume_dir", help="directory containing PDF/DOC/DOCX resumes")
+    parser.add_argument("jd_file", help="text file with the job description")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="results file; .csv writes CSV, anything else JSONL")
+    parser.add_argument("--must-have", default="", help="comma-separated must-have keywords")
+    parser.add_argument("--good-to-have", default="", help="comma-separated good-to-have keywords")
+    parser.add_argument("--top-k", type=int, default=PRERANK_TOP_K, help="resumes sent to the AI after local pre-ranking (0 = all)")
+    parser.add_argument("--local-only", action="store_true", help="rank locally without any AI calls")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_REQUESTS, help="model calls in flight at once")
+    parser.add_argument("--rpm", type=float, default=REQUESTS_PER_MINUTE, help="model calls per minute")
+    parser.add_argument("--resumes-per-request", type=int, default=RESUMES_PER_REQUEST, help="resumes packed into one model call")
+    parser.add_argument("--batch-token-budget", type=int, default=BATCH_TOKEN_BUDGET, help="approximate prompt tokens per packed call")
+    parser.add_argument("--resume-token-budget", type=int, default=RESUME_TOKEN_BUDGET, help="approximate tokens of each resume sent to the model (0 = no cap)")
+    parser.add_argument("--base-url", default=MODEL_BASE_URL, help="OpenAI-compatible model endpoint")
+    parser.add_argument("--model", default=MODEL_NAME, help="model name sent to the endpoint")
+    args = parser.parse_args(argv)
+
+    with open(args.jd_file, encoding="utf-8") as f:
+        jd = f.read()
+    if not jd.strip():
+        parser.error(f"{args.jd_file} is empty")
+    resumes = load_resumes(args.resume_dir)
+    if not resumes:
+        parser.error(f"no PDF/DOC/DOCX files found in {args.resume_dir}")
+
+    started = time.perf_counter()
+    agent = None if args.local_only else build_agent(os.getenv("GEMINI_API_KEY"), base_url=args.base_url, model_name=args.model)
+    run = asyncio.run(analyze_resumes(
+        resumes, jd, args.must_have, args.good_to_have, args.top_k, args.local_only, agent=agent,
+        max_concurrent=args.concurrency, requests_per_minute=args.rpm,
+        resumes_per_request=args.resumes_per_request, batch_token_budget=args.batch_token_budget,
+        resume_token_budget=args.resume_token_budget,
+    ))
+    write_results(result_rows(run), args.output)
+    print(
+        f"{len(resumes)} resumes, {len(run.ranked())} scored ({run.reused_count} reused from earlier uploads), "
+        f"{run.filtered_count} filtered by keywords, {run.duplicate_count} duplicates skipped, "
+        f"cache {run.cache_hits} hits / {run.cache_misses} misses, resume tokens {run.resume_tokens} -> {run.prompt_tokens} in {time.perf_counter() - started:.1f}s -> {args.output}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
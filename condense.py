@@ -0,0 +1,113 @@
+import os
+import re
+
+from llm import estimate_tokens
+from ranking import tokenize
+
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "3000"))
+
+HYPHENATION_PATTERN = re.compile(r"([\w-]*\w)-\n(\w)")
+SPACE_PATTERN = re.compile(r"[^\S\n]+")
+PAGE_NUMBER_PATTERN = re.compile(r"(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?", re.IGNORECASE)
+PAGE_LABEL_PATTERN = re.compile(r"\bpage\s*\d+(?:\s*(?:of|/)\s*\d+)?\b", re.IGNORECASE)
+DIGITS_PATTERN = re.compile(r"\d+")
+# Running headers and footers are looked for among this many lines at the top and bottom of each page.
+PAGE_EDGE_LINES = 3
+HEADINGS = frozenset("""
+summary profile objective about experience employment work history professional skills technical competencies
+education qualifications certifications certificates projects publications awards honors achievements languages
+interests hobbies references volunteer activities training courses research patents presentations
+""".split())
+
+
+def _join_hyphenated(match):
+    # "engin-\neer" is one word broken by the line wrap; "state-of-the-\nart" and "Python-\nBased" keep the hyphen.
+    prefix, first = match.groups()
+    return f"{prefix}{first}" if "-" not in prefix and first.islower() else f"{prefix}-{first}"
+
+
+def _edge_key(line):
+    # Digits only differ between copies of a "Page N" footer, so they are ignored on those lines alone.
+    key = line.lower()
+    return DIGITS_PATTERN.sub("#", key) if PAGE_LABEL_PATTERN.search(key) else key
+
+
+def normalize_resume_text(text):
+    # Joins words hyphenated across line breaks and collapses whitespace runs. Pages are separated by form feeds;
+    # at the top and bottom of each page, page numbers and lines already seen at an earlier page's edge (running
+    # headers/footers) are dropped. Repeated lines inside a page body, such as job titles or bullets, are kept.
+    text = HYPHENATION_PATTERN.sub(_join_hyphenated, text.replace("\r", "\n"))
+    lines, seen_edges = [], set()
+    for page in text.split("\f"):
+        page_lines = [SPACE_PATTERN.sub(" ", line).strip() for line in page.split("\n")]
+        filled = [position for position, line in enumerate(page_lines) if line]
+        edges = set(filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:])
+        page_edges = set()
+        for position, line in enumerate(page_lines):
+            if not line:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            if position in edges:
+                key = _edge_key(line)
+                if key in seen_edges or PAGE_NUMBER_PATTERN.fullmatch(line):
+                    continue
+                page_edges.add(key)
+            lines.append(line)
+        seen_edges |= page_edges
+    return "\n".join(lines).strip()
+
+
+def _is_heading(line):
+    words = line.lower().rstrip(":").replace("&", " ").split()
+    return 0 < len(words) <= 4 and any(word in HEADINGS for word in words)
+
+
+def split_sections(text):
+    sections, current = [], []
+    for line in text.split("\n"):
+        if (not line or _is_heading(line)) and current:
+            sections.append(current)
+            current = []
+        if line:
+            current.append(line)
+    if current:
+        sections.append(current)
+    return sections
+
+
+def condense_resume(text, terms, token_budget=RESUME_TOKEN_BUDGET):
+    # Returns (prompt text, tokens before, tokens after). Over budget, the opening section (name, contact, summary)
+    # is always kept, then the sections densest in JD terms, truncated at a line boundary, in their original order.
+    tokens_before = estimate_tokens(text)
+    text = normalize_resume_text(text)
+    if token_budget <= 0 or estimate_tokens(text) <= token_budget:
+        return text, tokens_before, estimate_tokens(text)
+
+    sections = split_sections(text)
+    term_set = set(terms)
+
+    def relevance(position):
+        words = tokenize(" ".join(sections[position]))
+        return sum(word in term_set for word in words) / (len(words) + 1)
+
+    order = [0] + sorted(range(1, len(sections)), key=relevance, reverse=True)
+    kept, remaining = {}, token_budget
+    for position in order:
+        lines = []
+        for line in sections[position]:
+            cost = estimate_tokens(line)
+            if cost > remaining:
+                # PDF text often comes out as a few very long lines; cut those rather than dropping them.
+                if not lines and remaining > 1:
+                    lines.append(line[:(remaining - 1) * 4])
+                    remaining = 0
+                break
+            lines.append(line)
+            remaining -= cost
+        if lines:
+            kept[position] = lines
+        if remaining <= 0:
+            break
+    condensed = "\n\n".join("\n".join(kept[position]) for position in sorted(kept))
+    return condensed, tokens_before, estimate_tokens(condensed)
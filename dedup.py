@@ -0,0 +1,151 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+
+from condense import normalize_resume_text
+
+DUPLICATE_INDEX_PATH = os.getenv("DUPLICATE_INDEX_PATH", os.path.join(".cache", "duplicates.sqlite3"))
+DUPLICATE_INDEX_MAX_ENTRIES = int(os.getenv("DUPLICATE_INDEX_MAX_ENTRIES", "50000"))
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.9"))
+
+SHINGLE_SIZE = 5
+# Every word and number counts here, unlike ranking's tokenizer: "Candidate 1" and "Candidate 3" are different people.
+WORD_PATTERN = re.compile(r"\w+")
+LSH_BANDS = 16
+LSH_ROWS = 4
+MINHASH_PRIME = (1 << 61) - 1
+# Fixed seed: signatures are persisted, so every process must use the same permutations.
+_rng = np.random.default_rng(20240601)
+MINHASH_A = _rng.integers(1, 1 << 31, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+MINHASH_B = _rng.integers(0, 1 << 31, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    content_hash: str
+    signature: np.ndarray
+
+    def buckets(self):
+        # One LSH bucket per band; two resumes share a bucket with high probability once their
+        # shingle sets overlap by more than roughly (1 / LSH_BANDS) ** (1 / LSH_ROWS) (~0.5).
+        bands = self.signature.reshape(LSH_BANDS, LSH_ROWS)
+        return [f"{band}:{hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest()}" for band, row in enumerate(bands)]
+
+    @classmethod
+    def from_stored(cls, content_hash, signature):
+        return cls(content_hash, np.frombuffer(signature, dtype=np.uint64))
+
+    def similarity(self, other):
+        # Fraction of agreeing MinHash values, an estimate of the Jaccard similarity of the shingle sets.
+        return float(np.mean(self.signature == other.signature))
+
+
+def fingerprint_text(text):
+    # Exact-content hash of the normalized text plus a MinHash signature over word 5-gram shingles.
+    tokens = WORD_PATTERN.findall(normalize_resume_text(text).lower())
+    content_hash = hashlib.sha256(" ".join(tokens).encode("utf-8")).hexdigest()
+    shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(max(1, len(tokens) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    # a * x + b stays below 2**64 because a, b < 2**31 and the CRC32 values x < 2**32.
+    signature = ((hashes[:, None] * MINHASH_A + MINHASH_B) % MINHASH_PRIME).min(axis=0)
+    return Fingerprint(content_hash, signature)
+
+
+# In-memory LSH index for one upload: find() returns the key of an earlier near-identical resume.
+class DuplicateFinder:
+    def __init__(self, threshold=DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.by_hash = {}
+        self.by_bucket = {}
+        self.fingerprints = {}
+
+    def find(self, fingerprint):
+        if fingerprint.content_hash in self.by_hash:
+            return self.by_hash[fingerprint.content_hash]
+        for bucket in fingerprint.buckets():
+            for key in self.by_bucket.get(bucket, ()):
+                if fingerprint.similarity(self.fingerprints[key]) >= self.threshold:
+                    return key
+        return None
+
+    def add(self, fingerprint, key):
+        self.by_hash.setdefault(fingerprint.content_hash, key)
+        self.fingerprints[key] = fingerprint
+        for bucket in fingerprint.buckets():
+            self.by_bucket.setdefault(bucket, []).append(key)
+
+
+# Persistent per-scope (JD + model) record of scored resumes, so a near-identical resume uploaded in a later
+# session reuses the earlier result instead of costing another model call. Oldest entries are evicted first.
+class DuplicateIndex:
+    def __init__(self, path=DUPLICATE_INDEX_PATH, threshold=DUPLICATE_THRESHOLD, max_entries=DUPLICATE_INDEX_MAX_ENTRIES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS resumes (
+                id INTEGER PRIMARY KEY, scope TEXT NOT NULL, content_hash TEXT NOT NULL, signature BLOB NOT NULL,
+                name TEXT NOT NULL, response TEXT NOT NULL, created_at REAL NOT NULL,
+                UNIQUE (scope, content_hash)
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                scope TEXT NOT NULL, bucket TEXT NOT NULL, resume_id INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE
+            );
+            CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (scope, bucket);
+            CREATE INDEX IF NOT EXISTS buckets_resume ON buckets (resume_id);
+        """)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.commit()
+
+    # find and add are best effort: an unreadable index finds nothing and a failed write is skipped.
+    def find(self, scope, fingerprint):
+        # Returns (name, response JSON) of a previously scored near-duplicate in this scope, or None.
+        buckets = fingerprint.buckets()
+        with self.lock:
+            try:
+                row = self.conn.execute(
+                    "SELECT name, response FROM resumes WHERE scope = ? AND content_hash = ?", (scope, fingerprint.content_hash)
+                ).fetchone()
+                if row:
+                    return row
+                rows = self.conn.execute(
+                    f"SELECT DISTINCT r.name, r.response, r.signature FROM buckets b JOIN resumes r ON r.id = b.resume_id "
+                    f"WHERE b.scope = ? AND b.bucket IN ({', '.join('?' * len(buckets))})", (scope, *buckets)
+                ).fetchall()
+            except sqlite3.Error:
+                return None
+        for name, response, signature in rows:
+            if fingerprint.similarity(Fingerprint.from_stored("", signature)) >= self.threshold:
+                return name, response
+        return None
+
+    def add(self, scope, fingerprint, name, response):
+        with self.lock:
+            try:
+                with self.conn:
+                    cursor = self.conn.execute(
+                        "INSERT OR IGNORE INTO resumes (scope, content_hash, signature, name, response, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                        (scope, fingerprint.content_hash, fingerprint.signature.tobytes(), name, response, time.time()),
+                    )
+                    if cursor.rowcount:
+                        self.conn.executemany(
+                            "INSERT INTO buckets (scope, bucket, resume_id) VALUES (?, ?, ?)",
+                            [(scope, bucket, cursor.lastrowid) for bucket in fingerprint.buckets()],
+                        )
+                        self.conn.execute(
+                            "DELETE FROM resumes WHERE id IN (SELECT id FROM resumes ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                            (self.max_entries,),
+                        )
+            except sqlite3.Error:
+                pass
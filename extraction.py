@@ -0,0 +1,129 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2
+from docx import Document
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "30"))
+EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "30"))
+EXTRACTION_MAX_CHARS = int(os.getenv("EXTRACTION_MAX_CHARS", "50000"))
+
+
+def _take_until_cap(chunks, max_chars):
+    parts = []
+    total = 0
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts.append(chunk[:max_chars - total])
+        total += len(parts[-1])
+        if total >= max_chars:
+            break
+    return parts
+
+
+def extract_text(file_name, data, max_pages=EXTRACTION_MAX_PAGES, max_chars=EXTRACTION_MAX_CHARS):
+    file_name = file_name.lower()
+    if file_name.endswith(".pdf"):
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        # Pages are parsed lazily, so nothing past the page or character cap is ever decoded. Form feeds keep
+        # the page boundaries, where condense looks for running headers and footers.
+        pages = (reader.pages[i].extract_text() for i in range(min(len(reader.pages), max_pages)))
+        return "\f".join(_take_until_cap(pages, max_chars))
+    if file_name.endswith((".doc", ".docx")):
+        doc = Document(io.BytesIO(data))
+        return "\n".join(_take_until_cap((para.text for para in doc.paragraphs), max_chars))
+    return ""
+
+
+class _Deadline(BaseException):
+    # A BaseException so parser code catching Exception cannot swallow it.
+    pass
+
+
+def _raise_deadline(signum, frame):
+    raise _Deadline
+
+
+def _extract_in_worker(file_name, data, timeout):
+    # Runs on a pool worker and returns (text, seconds spent parsing). The timeout clock starts when parsing starts
+    # rather than when the file was queued, and the alarm interrupts a parser stuck on a malformed file instead of
+    # leaving the worker busy forever.
+    started = time.perf_counter()
+    if not timeout or not hasattr(signal, "setitimer"):
+        return extract_text(file_name, data), time.perf_counter() - started
+    previous = signal.signal(signal.SIGALRM, _raise_deadline)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_text(file_name, data), time.perf_counter() - started
+    except _Deadline:
+        raise TimeoutError(f"text extraction timed out after {timeout:g}s") from None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class ExtractionPool:
+    def __init__(self, max_workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT):
+        self.timeout = timeout
+        self.max_workers = max_workers
+        # The app process runs Streamlit and job threads that "fork" would copy mid-flight. Forkserver workers
+        # start from a clean single-threaded server that preloads this module; like spawn they still import the
+        # main script as __mp_main__, which app.py guards.
+        if "forkserver" in multiprocessing.get_all_start_methods():
+            self.context = multiprocessing.get_context("forkserver")
+            self.context.set_forkserver_preload(["extraction"])
+        else:
+            self.context = multiprocessing.get_context("spawn")
+        self.lock = threading.Lock()
+        self.executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.context)
+
+    def _replace_broken(self, executor):
+        # Every file in flight on a broken pool fails at once; only the first to get here builds the new one.
+        with self.lock:
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = self._new_executor()
+
+    async def extract(self, file_name, data, timings=None):
+        # timings, if given, gets "extract" (parsing on a worker) and "extract_wait" (queued for a free worker).
+        submitted = time.perf_counter()
+        for attempt in range(2):
+            executor = self.executor
+            try:
+                text, seconds = await self._run(executor, file_name, data)
+                break
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for using too much memory) and took the pool with it. Retry on a fresh
+                # pool once; a file that breaks that one too is failed on its own.
+                self._replace_broken(executor)
+                if attempt:
+                    raise RuntimeError("text extraction worker crashed") from None
+        if timings is not None:
+            timings["extract"] = seconds
+            timings["extract_wait"] = time.perf_counter() - submitted - seconds
+        return text
+
+    async def _run(self, executor, file_name, data):
+        future = asyncio.get_running_loop().run_in_executor(executor, _extract_in_worker, file_name, data, self.timeout)
+        if hasattr(signal, "setitimer"):
+            return await future
+        # No SIGALRM (Windows): fall back to a wall-clock limit that also counts time spent queued.
+        try:
+            return await asyncio.wait_for(future, self.timeout or None)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"text extraction timed out after {self.timeout:g}s") from None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
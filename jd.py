@@ -0,0 +1,38 @@
+import hashlib
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from keywords import KeywordFilter, parse_keywords
+from ranking import jd_terms
+
+JD_MAX_CHARS = int(os.getenv("JD_MAX_CHARS", "8000"))
+JD_CACHE_SIZE = int(os.getenv("JD_CACHE_SIZE", "256"))
+
+
+@dataclass(frozen=True)
+class PreparedJD:
+    text: str
+    digest: str
+    terms: tuple
+    keyword_filter: KeywordFilter
+
+
+def normalize_jd_text(jd, max_chars=JD_MAX_CHARS):
+    lines = (re.sub(r"[ \t ]+", " ", line).strip() for line in jd.splitlines())
+    text = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+    return text[:max_chars]
+
+
+# Everything derived from a requisition is computed once per (JD, keywords) and shared by every
+# resume in the batch and by later submissions of the same requisition in this process.
+@lru_cache(maxsize=JD_CACHE_SIZE)
+def prepare_jd(jd, must_have_keywords="", good_to_have_keywords=""):
+    text = normalize_jd_text(jd)
+    return PreparedJD(
+        text=text,
+        digest=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+        terms=tuple(jd_terms(text)),
+        keyword_filter=KeywordFilter(parse_keywords(must_have_keywords), parse_keywords(good_to_have_keywords)),
+    )
@@ -0,0 +1,330 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+from llm import MAX_CONCURRENT_REQUESTS, REQUESTS_PER_MINUTE, build_rate_limiter
+from pipeline import SCORED, ResumeOutcome, analyze_resumes
+from dedup import Fingerprint
+from jd import prepare_jd
+from results import ScreeningResult
+
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(".cache", "jobs.sqlite3"))
+MAX_ACTIVE_JOBS = int(os.getenv("MAX_ACTIVE_JOBS", "4"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Finished resumes are written to the job store in one transaction per interval instead of one per resume.
+JOB_SAVE_INTERVAL = float(os.getenv("JOB_SAVE_INTERVAL", "0.5"))
+# Consecutive failed writes of finished resumes, each one interval apart, before the job is failed.
+JOB_SAVE_ATTEMPTS = 3
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+# SQLite record of every job and of each resume's final outcome, written as results arrive so a
+# restarted worker can pick up where it left off and any Streamlit session can poll progress.
+# Each unfinished job is leased to one worker; another worker may only claim it once that lease expires.
+class JobStore:
+    def __init__(self, path=JOBS_DB_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, owner TEXT, status TEXT NOT NULL, jd TEXT NOT NULL, options TEXT NOT NULL,
+                total INTEGER NOT NULL, summary TEXT, error TEXT,
+                created_at REAL NOT NULL, started_at REAL, finished_at REAL, worker TEXT, lease_until REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (owner, created_at);
+            CREATE TABLE IF NOT EXISTS job_resumes (
+                job_id TEXT NOT NULL, idx INTEGER NOT NULL, name TEXT NOT NULL, data BLOB,
+                status TEXT NOT NULL DEFAULT '', response TEXT, error TEXT, finished_at REAL, resume_hash TEXT,
+                resume_signature BLOB,
+                PRIMARY KEY (job_id, idx)
+            );
+        """)
+        # Job stores created before resume hashes were recorded.
+        if "resume_hash" not in {row["name"] for row in self.conn.execute("PRAGMA table_info(job_resumes)")}:
+            self.conn.execute("ALTER TABLE job_resumes ADD COLUMN resume_hash TEXT")
+        # Job stores created before resume signatures were recorded.
+        if "resume_signature" not in {row["name"] for row in self.conn.execute("PRAGMA table_info(job_resumes)")}:
+            self.conn.execute("ALTER TABLE job_resumes ADD COLUMN resume_signature BLOB")
+        # Job stores created before jobs were leased.
+        if "worker" not in {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN worker TEXT")
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+        self.conn.commit()
+
+    def create_job(self, owner, resumes, jd, options, job_id=None, worker=None, lease_until=None):
+        job_id = job_id or uuid.uuid4().hex
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO jobs (id, owner, status, jd, options, total, created_at, worker, lease_until) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, owner, QUEUED, jd, json.dumps(options), len(resumes), time.time(), worker, lease_until),
+            )
+            self.conn.executemany(
+                "INSERT INTO job_resumes (job_id, idx, name, data) VALUES (?, ?, ?, ?)",
+                [(job_id, idx, name, data) for idx, (name, data) in enumerate(resumes, 1)],
+            )
+            self.conn.commit()
+        return job_id
+
+    def get_job(self, job_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            completed = self.conn.execute(
+                "SELECT COUNT(*) FROM job_resumes WHERE job_id = ? AND status != ''", (job_id,)
+            ).fetchone()[0]
+        job = dict(row)
+        job["options"] = json.loads(job["options"])
+        job["summary"] = json.loads(job["summary"]) if job["summary"] else {}
+        job["completed"] = completed
+        return job
+
+    def list_jobs(self, owner, limit=10):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, status, total, created_at FROM jobs WHERE owner = ? ORDER BY created_at DESC LIMIT ?", (owner, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def claimable_jobs(self, now):
+        # Unfinished jobs nobody holds a live lease on, oldest first.
+        with self.lock:
+            return [row[0] for row in self.conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?) ORDER BY created_at",
+                (QUEUED, RUNNING, now),
+            )]
+
+    def claim_job(self, job_id, worker, now, lease_until):
+        # One conditional UPDATE, so when several workers race for an orphaned job exactly one gets it.
+        with self.lock, self.conn:
+            return bool(self.conn.execute(
+                "UPDATE jobs SET worker = ?, lease_until = ? "
+                "WHERE id = ? AND status IN (?, ?) AND (lease_until IS NULL OR lease_until < ?)",
+                (worker, lease_until, job_id, QUEUED, RUNNING, now),
+            ).rowcount)
+
+    def renew_leases(self, worker, job_ids, lease_until):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status IN (?, ?)",
+                [(lease_until, job_id, worker, QUEUED, RUNNING) for job_id in job_ids],
+            )
+
+    def pending_resumes(self, job_id):
+        with self.lock:
+            return [(row["idx"], row["name"], row["data"]) for row in self.conn.execute(
+                "SELECT idx, name, data FROM job_resumes WHERE job_id = ? AND status = '' ORDER BY idx", (job_id,)
+            )]
+
+    def outcomes(self, job_id):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT idx, name, status, response, error FROM job_resumes WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        return [
+            ResumeOutcome(row["idx"], row["name"], row["status"], result=ScreeningResult.from_response(json.loads(row["response"])) if row["response"] else None, error=row["error"])
+            for row in rows
+        ]
+
+    def save_outcomes(self, job_id, outcomes):
+        # outcomes: (job resume number, ResumeOutcome) pairs, written in one transaction.
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                "UPDATE job_resumes SET status = ?, response = ?, error = ?, finished_at = ?, resume_hash = ?, resume_signature = ? "
+                "WHERE job_id = ? AND idx = ?",
+                [(outcome.status, json.dumps(outcome.response) if outcome.response else None, outcome.error, now,
+                  outcome.fingerprint.content_hash if outcome.fingerprint else None,
+                  outcome.fingerprint.signature.tobytes() if outcome.fingerprint else None, job_id, idx) for idx, outcome in outcomes],
+            )
+            self.conn.commit()
+
+    def scored_resumes(self, job_id):
+        # (resume hash, name, ScreeningResult) for every matched resume of the job.
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT resume_hash, name, response FROM job_resumes WHERE job_id = ? AND status = ? AND resume_hash IS NOT NULL",
+                (job_id, SCORED),
+            ).fetchall()
+        return [(row["resume_hash"], row["name"], ScreeningResult.from_response(json.loads(row["response"]))) for row in rows]
+
+    def scored_fingerprints(self, job_id):
+        # (Fingerprint, name) for every resume of the job scored before it was interrupted.
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT resume_hash, resume_signature, name FROM job_resumes WHERE job_id = ? AND status = ? AND resume_signature IS NOT NULL",
+                (job_id, SCORED),
+            ).fetchall()
+        return [(Fingerprint.from_stored(row["resume_hash"], row["resume_signature"]), row["name"]) for row in rows]
+
+    def mark_running(self, job_id):
+        with self.lock:
+            self.conn.execute("UPDATE jobs SET status = ?, started_at = COALESCE(started_at, ?) WHERE id = ?", (RUNNING, time.time(), job_id))
+            self.conn.commit()
+
+    def finish_job(self, job_id, status, summary=None, error=None):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE jobs SET status = ?, summary = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, json.dumps(summary or {}), error, time.time(), job_id),
+            )
+            # Uploaded files are only kept until the job can no longer be resumed.
+            self.conn.execute("UPDATE job_resumes SET data = NULL WHERE job_id = ?", (job_id,))
+            self.conn.commit()
+
+
+# Runs analyses on a dedicated event-loop thread so they outlive Streamlit reruns and disconnects.
+# All jobs share one semaphore and rate limiter, i.e. one bounded pool of model-call slots, and one agent
+# whose HTTP connection pool lives on this loop, so repeated submissions reuse warm keep-alive connections.
+# With an account_store, each finished job settles its owner's quota reservation and is added to their history.
+# Several app processes can share one JobStore: each renews the leases on its own jobs and claims a job left
+# behind by a stopped process once its lease runs out, so every job runs on one worker at a time.
+class JobManager:
+    def __init__(self, store=None, agent=None, result_cache=None, extraction_pool=None, duplicate_index=None,
+                 account_store=None, max_active_jobs=MAX_ACTIVE_JOBS, max_concurrent=MAX_CONCURRENT_REQUESTS,
+                 requests_per_minute=REQUESTS_PER_MINUTE, lease_seconds=JOB_LEASE_SECONDS):
+        self.store = store or JobStore()
+        self.account_store = account_store
+        self.agent = agent
+        self.result_cache = result_cache
+        self.duplicate_index = duplicate_index
+        self.extraction_pool = extraction_pool
+        self.job_slots = asyncio.Semaphore(max_active_jobs)
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.rate_limiter = build_rate_limiter(requests_per_minute=requests_per_minute, burst=max_concurrent)
+        self.lease_seconds = lease_seconds
+        self.worker = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Jobs this worker has scheduled and not yet finished; only their leases are renewed.
+        self.active_jobs = set()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="analysis-jobs", daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._keep_leases(), self.loop)
+
+    def submit(self, owner, resumes, jd, job_id=None, **options):
+        job_id = self.store.create_job(owner, resumes, jd, options, job_id, self.worker, time.time() + self.lease_seconds)
+        self._schedule(job_id)
+        return job_id
+
+    def _schedule(self, job_id):
+        self.active_jobs.add(job_id)
+        asyncio.run_coroutine_threadsafe(self._run_job(job_id), self.loop)
+
+    async def _keep_leases(self):
+        # Renews this worker's leases before looking for expired ones, so it never claims its own jobs twice.
+        while True:
+            now = time.time()
+            try:
+                await asyncio.to_thread(self.store.renew_leases, self.worker, list(self.active_jobs), now + self.lease_seconds)
+                for job_id in await asyncio.to_thread(self.store.claimable_jobs, now):
+                    if await asyncio.to_thread(self.store.claim_job, job_id, self.worker, now, now + self.lease_seconds):
+                        self.active_jobs.add(job_id)
+                        self.loop.create_task(self._run_job(job_id))
+            except sqlite3.Error:
+                # A busy database only delays renewal and claiming to the next round, well inside the lease.
+                pass
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _run_job(self, job_id):
+        # A failed analysis still ends the job: what was scored is recorded, the owner's reservation settled and the
+        # job marked failed. If the database itself fails, the job drops out of active_jobs, so its lease is no
+        # longer renewed and, once it runs out, the job is claimed again and resumed.
+        # SQLite calls run on worker threads so a slow commit never stalls the model calls sharing this loop.
+        try:
+            async with self.job_slots:
+                job = await asyncio.to_thread(self.store.get_job, job_id)
+                try:
+                    status, summary, error = DONE, await self._analyze(job), None
+                except Exception as e:
+                    status, summary, error = FAILED, None, str(e)
+                # Settling is idempotent, so recording again after a retry charges the owner once.
+                await asyncio.to_thread(self._record, job)
+                await asyncio.to_thread(self.store.finish_job, job_id, status, summary, error)
+        finally:
+            self.active_jobs.discard(job_id)
+
+    async def _analyze(self, job):
+        job_id = job["id"]
+        pending = await asyncio.to_thread(self.store.pending_resumes, job_id)
+        scored_before = await asyncio.to_thread(self.store.scored_fingerprints, job_id)
+        await asyncio.to_thread(self.store.mark_running, job_id)
+        # analyze_resumes numbers its input from 1; map back to the job's own resume numbers.
+        job_indexes = {position: idx for position, (idx, _, _) in enumerate(pending, 1)}
+        finished = []
+        analysis_done = asyncio.Event()
+
+        async def save_finished():
+            # A single writer, so a resume saved twice (e.g. a promoted duplicate) keeps its latest state. A batch
+            # that fails to save (e.g. the database stayed locked) is retried one interval later.
+            failures = 0
+            while True:
+                try:
+                    await asyncio.wait_for(analysis_done.wait(), JOB_SAVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                done = analysis_done.is_set()
+                if finished:
+                    batch = finished[:]
+                    del finished[:]
+                    try:
+                        await asyncio.to_thread(self.store.save_outcomes, job_id, batch)
+                        failures = 0
+                    except sqlite3.Error:
+                        failures += 1
+                        if done and failures >= JOB_SAVE_ATTEMPTS:
+                            raise
+                        finished[:0] = batch
+                        if done:
+                            await asyncio.sleep(JOB_SAVE_INTERVAL)
+                            continue
+                if done:
+                    return
+
+        saver = asyncio.create_task(save_finished())
+        try:
+            run = await analyze_resumes(
+                [(name, data) for _, name, data in pending], job["jd"], **job["options"],
+                agent=self.agent, result_cache=self.result_cache, extraction_pool=self.extraction_pool,
+                duplicate_index=self.duplicate_index, scored_before=scored_before,
+                semaphore=self.semaphore, rate_limiter=self.rate_limiter,
+                on_outcome=lambda outcome: finished.append((job_indexes[outcome.index], outcome)),
+            )
+        finally:
+            analysis_done.set()
+            await saver
+        return {
+            "candidate_count": run.candidate_count,
+            "shortlisted_count": run.shortlisted_count,
+            "filtered_count": run.filtered_count,
+            "cache_hits": run.cache_hits,
+            "cache_misses": run.cache_misses,
+            "duplicate_count": run.duplicate_count,
+            "reused_count": run.reused_count,
+            "local_only": run.local_only,
+        }
+
+    def _record(self, job):
+        if self.account_store:
+            self.account_store.finish_analysis(job["owner"], job["id"], prepare_jd(job["jd"]).digest, self.store.scored_resumes(job["id"]))
+
+    def get_job(self, job_id):
+        return self.store.get_job(job_id)
+
+    def outcomes(self, job_id):
+        return self.store.outcomes(job_id)
+
+    def list_jobs(self, owner, limit=10):
+        return self.store.list_jobs(owner, limit)
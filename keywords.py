@@ -0,0 +1,43 @@
+import re
+
+
+def parse_keywords(keywords):
+    return [kw.strip() for kw in keywords.split(",") if kw.strip()] if keywords else []
+
+
+def normalize_keyword(keyword):
+    return " ".join(keyword.split()).casefold()
+
+
+# Single compiled, case-insensitive regex over every keyword; (?<!\w)/(?!\w) act as word
+# boundaries that also work for keywords such as "C++" or ".NET".
+class KeywordMatcher:
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(normalize_keyword(kw) for kw in keywords))
+        self.pattern = None
+        if self.keywords:
+            alternatives = sorted((r"\s+".join(map(re.escape, kw.split())) for kw in self.keywords), key=len, reverse=True)
+            self.pattern = re.compile(r"(?<!\w)(?:" + "|".join(alternatives) + r")(?!\w)", re.IGNORECASE)
+
+    def find(self, text):
+        if self.pattern is None:
+            return set()
+        return {normalize_keyword(match) for match in self.pattern.findall(text)}
+
+
+# Must-have / good-to-have gate evaluated on extracted text before any model call.
+class KeywordFilter:
+    def __init__(self, must_have_list, good_to_have_list):
+        self.must_have = [normalize_keyword(kw) for kw in must_have_list]
+        self.good_to_have = [normalize_keyword(kw) for kw in good_to_have_list]
+        self.matcher = KeywordMatcher(self.must_have + self.good_to_have)
+
+    def check(self, text):
+        if not self.must_have and not self.good_to_have:
+            return None
+        found = self.matcher.find(text)
+        if not all(kw in found for kw in self.must_have):
+            return "must_have"
+        if self.good_to_have and not any(kw in found for kw in self.good_to_have):
+            return "good_to_have"
+        return None
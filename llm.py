@@ -0,0 +1,171 @@
+import asyncio
+import importlib.util
+import os
+import random
+import time
+
+import httpx
+from agents import Agent, ModelSettings, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import set_tracing_disabled
+from openai import DefaultAsyncHttpxClient, RateLimitError
+from openai.types.responses import ResponseTextDeltaEvent
+
+from results import JSONScanner
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+MODEL_BASE_URL = os.getenv("MODEL_BASE_URL", GEMINI_BASE_URL)
+MODEL_NAME = os.getenv("MODEL_NAME", "gemini-2.0-flash")
+
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
+REQUESTS_PER_MINUTE = float(os.getenv("REQUESTS_PER_MINUTE", "60"))
+MAX_RETRIES = int(os.getenv("MAX_RETRIES", "5"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "1.0"))
+RETRY_MAX_DELAY = 30.0
+RESUMES_PER_REQUEST = int(os.getenv("RESUMES_PER_REQUEST", "1"))
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", "12000"))
+MODEL_MAX_CONNECTIONS = int(os.getenv("MODEL_MAX_CONNECTIONS", str(MAX_CONCURRENT_REQUESTS)))
+MODEL_MAX_KEEPALIVE = int(os.getenv("MODEL_MAX_KEEPALIVE", str(MODEL_MAX_CONNECTIONS)))
+MODEL_KEEPALIVE_EXPIRY = float(os.getenv("MODEL_KEEPALIVE_EXPIRY", "60"))
+MODEL_HTTP2 = os.getenv("MODEL_HTTP2", "1") == "1"
+MODEL_JSON_MODE = os.getenv("MODEL_JSON_MODE", "0") == "1"
+
+AGENT_INSTRUCTIONS = """
+            You are a skilled ATS system. You are an experienced Resume analyzer who's has 40 years experience in every tech field. Use your experience and analyze the resume against the job description carefully and provide:
+            - Percentage match (e.g., "75%")
+            - Missing keywords
+            - Matching keywords (keywords from the job description that are present in the resume)
+            - Profile summary
+            - Candidate's total years of experience
+            - Key skill strengths
+            Return ONLY valid JSON format: {
+                "##JD Match": "X%",
+                "##Missing Keywords": [],
+                "##Matching Keywords": [],
+                "##Profile Summary": "...",
+                "##Years of Experience": "Y years",
+                "##Key Skill Strengths": ["skill1", "skill2"]
+            }
+            Keep your response short and complete you response within 100 words. Just be honest about your response because it is the question of company's policy and future i will tip you 20000 dollars for best satisfying responses.
+            """
+
+# A complete prompt of its own: the single-resume one asks for exactly one JSON object.
+BATCH_INSTRUCTIONS = """
+            You are a skilled ATS system. You are an experienced Resume analyzer who's has 40 years experience in every tech field.
+            You will receive several resumes, each introduced by a line "### Resume <id>", followed by one job description.
+            Analyze every resume against the job description independently and provide for each:
+            - Percentage match (e.g., "75%")
+            - Missing keywords
+            - Matching keywords (keywords from the job description that are present in the resume)
+            - Profile summary
+            - Candidate's total years of experience
+            - Key skill strengths
+            Return ONLY a valid JSON array with one object per resume, in the order the resumes were given, where
+            "resume_id" is the resume's <id>: [
+                {
+                    "resume_id": "<id>",
+                    "##JD Match": "X%",
+                    "##Missing Keywords": [],
+                    "##Matching Keywords": [],
+                    "##Profile Summary": "...",
+                    "##Years of Experience": "Y years",
+                    "##Key Skill Strengths": ["skill1", "skill2"]
+                }
+            ]
+            If you must answer with a JSON object, return {"results": [...]} holding that array.
+            Keep each resume's entry short, within 100 words. Just be honest about your response because it is the question of company's policy.
+            """
+
+
+def estimate_tokens(text):
+    # Rough 4-characters-per-token estimate; only used to keep packed prompts under budget.
+    return len(text) // 4 + 1
+
+
+# Token bucket shared by every request of a run: `rate` calls per second, bursts up to `capacity`.
+class RateLimiter:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def build_rate_limiter(requests_per_minute=REQUESTS_PER_MINUTE, burst=MAX_CONCURRENT_REQUESTS):
+    return RateLimiter(rate=requests_per_minute / 60, capacity=max(1, burst))
+
+
+def build_http_client(max_connections=MODEL_MAX_CONNECTIONS, max_keepalive=MODEL_MAX_KEEPALIVE,
+                      keepalive_expiry=MODEL_KEEPALIVE_EXPIRY, http2=MODEL_HTTP2):
+    # Pooled keep-alive connections; HTTP/2 multiplexing is only negotiated when the optional h2 package is installed.
+    # The pool belongs to the event loop that first uses it, so share a client only between runs on one loop.
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive,
+                          keepalive_expiry=keepalive_expiry)
+    return DefaultAsyncHttpxClient(limits=limits, http2=http2 and importlib.util.find_spec("h2") is not None)
+
+
+def build_agent(api_key, base_url=MODEL_BASE_URL, model_name=MODEL_NAME, http_client=None, json_mode=MODEL_JSON_MODE):
+    # Retries are handled in run_agent so that they go back through the rate limiter.
+    provider = AsyncOpenAI(base_url=base_url, api_key=api_key, max_retries=0, http_client=http_client or build_http_client())
+    model = OpenAIChatCompletionsModel(model=model_name, openai_client=provider)
+    set_tracing_disabled(disabled=True)
+    # JSON mode makes the endpoint itself guarantee a JSON object; only enable it for endpoints that accept response_format.
+    model_settings = ModelSettings(extra_body={"response_format": {"type": "json_object"}}) if json_mode else ModelSettings()
+    return Agent(name="ATS Agent", instructions=AGENT_INSTRUCTIONS, model=model, model_settings=model_settings)
+
+
+def build_batch_agent(agent):
+    return agent.clone(name="ATS Batch Agent", instructions=BATCH_INSTRUCTIONS)
+
+
+def _retry_delay(error, attempt):
+    retry_after = error.response.headers.get("retry-after") if error.response is not None else None
+    try:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        delay = min(RETRY_BASE_DELAY * 2 ** attempt, RETRY_MAX_DELAY)
+        return delay + random.uniform(0, delay / 2)
+
+
+async def run_agent(agent, resume_input, semaphore, rate_limiter, max_retries=MAX_RETRIES, stop_after_json=None, timings=None):
+    # stop_after_json: JSON openers (e.g. "{") after which to stop streaming once the first such value has closed and
+    # the model keeps talking. A stream that simply ends is drained so its connection can go back to the pool.
+    # timings, if given, accumulates "model" (seconds spent on requests) and "model_wait" (seconds waiting for a
+    # concurrency slot, the rate limiter or a retry back-off).
+    timings = {} if timings is None else timings
+    waiting_since = time.perf_counter()
+    async with semaphore:
+        for attempt in range(max_retries + 1):
+            await rate_limiter.acquire()
+            started = time.perf_counter()
+            timings["model_wait"] = timings.get("model_wait", 0.0) + started - waiting_since
+            try:
+                result = Runner.run_streamed(starting_agent=agent, input=resume_input)
+                scanner = JSONScanner(stop_after_json) if stop_after_json else None
+                full_response = ""
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        full_response += event.data.delta
+                        if scanner and scanner.feed(full_response) and full_response[scanner.end:].strip(" \n`"):
+                            result.cancel()
+                            break
+                return full_response
+            except RateLimitError as e:
+                if attempt == max_retries:
+                    raise
+                delay = _retry_delay(e, attempt)
+            finally:
+                waiting_since = time.perf_counter()
+                timings["model"] = timings.get("model", 0.0) + waiting_since - started
+            await asyncio.sleep(delay)
@@ -0,0 +1,368 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from llm import (
+    BATCH_TOKEN_BUDGET, MAX_CONCURRENT_REQUESTS, REQUESTS_PER_MINUTE, RESUMES_PER_REQUEST,
+    build_agent, build_batch_agent, build_rate_limiter, estimate_tokens, run_agent,
+)
+from cache import ResultCache, result_cache_key
+from extraction import ExtractionPool
+from ranking import PRERANK_TOP_K, local_analysis, rank_resumes, shortlist
+from jd import prepare_jd
+from condense import RESUME_TOKEN_BUDGET, condense_resume
+from dedup import DuplicateFinder, DuplicateIndex, fingerprint_text
+from results import JSONScanner, ScreeningResult
+
+SCORED = "scored"
+EXTRACTION_FAILED = "extraction_failed"
+NO_TEXT = "no_text"
+MISSING_MUST_HAVE = "missing_must_have"
+MISSING_GOOD_TO_HAVE = "missing_good_to_have"
+NOT_SHORTLISTED = "not_shortlisted"
+MODEL_FAILED = "model_failed"
+UNPARSED = "unparsed"
+DUPLICATE = "duplicate"
+
+KEYWORD_FILTER_STATUSES = {"must_have": MISSING_MUST_HAVE, "good_to_have": MISSING_GOOD_TO_HAVE}
+
+
+@dataclass
+class ResumeOutcome:
+    index: int
+    name: str
+    status: str = ""
+    text: str = field(default="", repr=False)
+    prompt_text: str = field(default="", repr=False)
+    resume_tokens: int = 0
+    prompt_tokens: int = 0
+    fingerprint: object = field(default=None, repr=False)
+    duplicate_of: str | None = None
+    result: ScreeningResult | None = None
+    error: str | None = None
+    timings: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def response(self):
+        return self.result.to_response() if self.result else None
+
+
+@dataclass
+class AnalysisRun:
+    outcomes: list
+    candidate_count: int = 0
+    shortlisted_count: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    local_only: bool = False
+    timings: dict = field(default_factory=dict)
+
+    @property
+    def filtered_count(self):
+        return sum(outcome.status in (MISSING_MUST_HAVE, MISSING_GOOD_TO_HAVE) for outcome in self.outcomes)
+
+    @property
+    def duplicate_count(self):
+        return sum(outcome.status == DUPLICATE for outcome in self.outcomes)
+
+    @property
+    def reused_count(self):
+        # Scored by reusing the stored result of a near-identical resume from an earlier upload.
+        return sum(outcome.status == SCORED and outcome.duplicate_of is not None for outcome in self.outcomes)
+
+    @property
+    def resume_tokens(self):
+        return sum(outcome.resume_tokens for outcome in self.outcomes if outcome.prompt_text)
+
+    @property
+    def prompt_tokens(self):
+        return sum(outcome.prompt_tokens for outcome in self.outcomes if outcome.prompt_text)
+
+    def ranked(self):
+        return sorted((outcome for outcome in self.outcomes if outcome.status == SCORED), key=rank_key, reverse=True)
+
+
+@contextmanager
+def timed(timings, stage):
+    # Accumulates wall-clock seconds per pipeline stage for benchmarking.
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+def rank_key(outcome):
+    # Higher match first; ties keep upload order.
+    return outcome.result.match, -outcome.index
+
+
+def extract_json_from_response(response_text):
+    return JSONScanner().value(response_text)
+
+
+def parse_result(response_text):
+    return ScreeningResult.from_response(extract_json_from_response(response_text))
+
+
+def split_batch_response(response_text, resume_ids):
+    # Returns {resume id: ScreeningResult} for every valid entry; ids that are missing or malformed are left out.
+    # JSON mode can only return an object, so an array nested under any key is accepted too.
+    parsed = JSONScanner("[{").value(response_text)
+    if isinstance(parsed, dict):
+        parsed = next((value for value in parsed.values() if isinstance(value, list)), None)
+    results = {}
+    for item in parsed if isinstance(parsed, list) else []:
+        if isinstance(item, dict) and str(item.get("resume_id")) in resume_ids:
+            if result := ScreeningResult.from_response(item):
+                results[str(item["resume_id"])] = result
+    return results
+
+
+def pack_resumes(outcomes, max_resumes, token_budget):
+    batches = []
+    batch, batch_tokens = [], 0
+    for outcome in outcomes:
+        tokens = outcome.prompt_tokens
+        if batch and (len(batch) >= max_resumes or batch_tokens + tokens > token_budget):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(outcome)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+async def analyze_resumes(resumes, jd, must_have_keywords="", good_to_have_keywords="", prerank_top_k=PRERANK_TOP_K,
+                          local_only=False, agent=None, result_cache=None, extraction_pool=None,
+                          max_concurrent=MAX_CONCURRENT_REQUESTS, requests_per_minute=REQUESTS_PER_MINUTE, on_outcome=None,
+                          resumes_per_request=RESUMES_PER_REQUEST, batch_token_budget=BATCH_TOKEN_BUDGET,
+                          semaphore=None, rate_limiter=None, resume_token_budget=RESUME_TOKEN_BUDGET, duplicate_index=None,
+                          scored_before=()):
+    # resumes: iterable of (file name, file bytes). Returns an AnalysisRun with one outcome per resume, in input order.
+    # on_outcome(outcome) is called as soon as each resume reaches its final status.
+    # resumes_per_request > 1 packs several resumes into one model call against a single copy of the JD.
+    # Pass a shared semaphore/rate_limiter to make concurrent runs draw from the same pool of model-call slots.
+    # Keyword filtering and local ranking see the full text; prompts get it normalized and cut to resume_token_budget.
+    # Near-identical resumes in one upload are scored once; one already scored for this JD and model in an earlier
+    # upload reuses that result from duplicate_index. Either way no model call is made for the duplicate.
+    # scored_before: (Fingerprint, name) of resumes this job scored before it was interrupted; copies of them are
+    # duplicates, not results reused from duplicate_index.
+    # Within an upload the first uploaded copy is reported as the original, whichever copy was scored; if it cannot be
+    # scored, the next copy is scored instead. Scoring never waits on extraction of unrelated resumes.
+    if agent is None and not local_only:
+        agent = build_agent(os.getenv("GEMINI_API_KEY"))
+    result_cache = result_cache or ResultCache()
+    duplicate_index = duplicate_index or DuplicateIndex()
+    duplicate_finder = DuplicateFinder()
+    scored_finder = DuplicateFinder()
+    for fingerprint, name in scored_before:
+        scored_finder.add(fingerprint, name)
+    owns_pool = extraction_pool is None
+    extraction_pool = extraction_pool or ExtractionPool()
+    prepared_jd = prepare_jd(jd, must_have_keywords, good_to_have_keywords)
+    # Results are only reused for the same JD and model; local-only scores are never stored.
+    duplicate_scope = None if local_only else f"{prepared_jd.digest}:{agent.model.model}"
+    keyword_filter = prepared_jd.keyword_filter
+    semaphore = semaphore or asyncio.Semaphore(max_concurrent)
+    rate_limiter = rate_limiter or build_rate_limiter(requests_per_minute=requests_per_minute, burst=max_concurrent)
+    batch_agent = build_batch_agent(agent) if agent is not None and resumes_per_request > 1 else None
+
+    def finish(outcome, status, error=None):
+        outcome.status, outcome.error = status, error
+        if on_outcome:
+            on_outcome(outcome)
+
+    async def extract_and_filter(outcome, data):
+        try:
+            outcome.text = await extraction_pool.extract(outcome.name, data, outcome.timings)
+        except Exception as e:
+            finish(outcome, EXTRACTION_FAILED, str(e))
+            return
+        with timed(outcome.timings, "filter"):
+            skip_reason = keyword_filter.check(outcome.text) if outcome.text else None
+        if not outcome.text:
+            finish(outcome, NO_TEXT)
+        elif skip_reason:
+            finish(outcome, KEYWORD_FILTER_STATUSES[skip_reason])
+
+    async def prepare_resume(outcome, data):
+        await extract_and_filter(outcome, data)
+        if not outcome.status:
+            await check_duplicate(outcome)
+
+    async def check_duplicate(outcome):
+        with timed(outcome.timings, "dedupe"):
+            outcome.fingerprint = fingerprint_text(outcome.text)
+            scored = scored_finder.find(outcome.fingerprint)
+            original = duplicate_finder.find(outcome.fingerprint) if scored is None else None
+        if scored is not None:
+            outcome.duplicate_of = scored
+            finish(outcome, DUPLICATE, f"duplicate of {scored}")
+            return
+        if original is not None:
+            # Held without a status until the original's is final; see settle_duplicates.
+            outcome.duplicate_of = run.outcomes[original - 1].name
+            duplicates.setdefault(original, []).append(outcome)
+            return
+        # Added before the lookup below yields, so a copy finishing meanwhile is held on this one.
+        duplicate_finder.add(outcome.fingerprint, outcome.index)
+        if not duplicate_scope:
+            return
+        with timed(outcome.timings, "dedupe"):
+            previous = await asyncio.to_thread(duplicate_index.find, duplicate_scope, outcome.fingerprint)
+        if previous:
+            outcome.duplicate_of = previous[0]
+            await apply_response(outcome, previous[1])
+
+    def condense(outcome):
+        if not outcome.prompt_text:
+            with timed(outcome.timings, "condense"):
+                outcome.prompt_text, outcome.resume_tokens, outcome.prompt_tokens = condense_resume(
+                    outcome.text, prepared_jd.terms, resume_token_budget)
+
+    def cache_key_for(outcome):
+        condense(outcome)
+        return result_cache_key(outcome.prompt_text, prepared_jd.text, agent.instructions, agent.model.model)
+
+    async def cached_response(outcome):
+        # Hits and misses are counted per run; the cache's own totals are shared by every concurrent job.
+        full_response = await asyncio.to_thread(result_cache.get, cache_key_for(outcome))
+        if full_response is None:
+            run.cache_misses += 1
+        else:
+            run.cache_hits += 1
+        return full_response
+
+    async def apply_result(outcome, result):
+        outcome.result = result
+        if result and duplicate_scope and outcome.duplicate_of is None:
+            await asyncio.to_thread(duplicate_index.add, duplicate_scope, outcome.fingerprint, outcome.name, json.dumps(result.to_response()))
+        finish(outcome, SCORED if result else UNPARSED)
+
+    async def apply_response(outcome, full_response):
+        with timed(outcome.timings, "parse"):
+            result = parse_result(full_response)
+        await apply_result(outcome, result)
+
+    async def score_resume(outcome, check_cache=True):
+        cache_key = cache_key_for(outcome)
+        if check_cache and (full_response := await cached_response(outcome)) is not None:
+            await apply_response(outcome, full_response)
+            return
+        resume_input = f"Evaluate resume:\n{outcome.prompt_text}\n\nJob Description:\n{prepared_jd.text}"
+        try:
+            full_response = await run_agent(agent, resume_input, semaphore, rate_limiter, stop_after_json="{", timings=outcome.timings)
+        except Exception as e:
+            finish(outcome, MODEL_FAILED, str(e))
+            return
+        with timed(outcome.timings, "parse"):
+            result = parse_result(full_response)
+        if result:
+            # Only the validated, normalized result is cached.
+            await asyncio.to_thread(result_cache.set, cache_key, json.dumps(result.to_response()))
+        await apply_result(outcome, result)
+
+    async def score_batch(batch):
+        if len(batch) == 1:
+            await score_resume(batch[0], check_cache=False)
+            return
+        by_id = {f"R{outcome.index}": outcome for outcome in batch}
+        resumes_block = "\n\n".join(f"### Resume {resume_id}\n{outcome.prompt_text}" for resume_id, outcome in by_id.items())
+        resume_input = f"Evaluate resumes:\n{resumes_block}\n\nJob Description:\n{prepared_jd.text}"
+        batch_timings = {}
+        try:
+            full_response = await run_agent(batch_agent, resume_input, semaphore, rate_limiter, stop_after_json="[{", timings=batch_timings)
+            with timed(batch_timings, "parse"):
+                parsed = split_batch_response(full_response, by_id)
+        except Exception:
+            parsed = {}
+        for outcome in batch:
+            outcome.timings.update(batch_timings)
+        fallback = []
+        for resume_id, outcome in by_id.items():
+            if resume_id in parsed:
+                await asyncio.to_thread(result_cache.set, cache_key_for(outcome), json.dumps(parsed[resume_id].to_response()))
+                await apply_result(outcome, parsed[resume_id])
+            else:
+                fallback.append(outcome)
+        await asyncio.gather(*(score_resume(outcome, check_cache=False) for outcome in fallback))
+
+    async def score_resumes(outcomes):
+        if resumes_per_request <= 1:
+            await asyncio.gather(*(score_resume(outcome) for outcome in outcomes))
+            return
+        uncached = []
+        for outcome, full_response in zip(outcomes, await asyncio.gather(*(cached_response(outcome) for outcome in outcomes))):
+            if full_response is not None:
+                await apply_response(outcome, full_response)
+            else:
+                uncached.append(outcome)
+        batches = pack_resumes(uncached, resumes_per_request, batch_token_budget - estimate_tokens(prepared_jd.text))
+        await asyncio.gather(*(score_batch(batch) for batch in batches))
+
+    async def prepare_and_score(outcome, data):
+        await prepare_resume(outcome, data)
+        if is_candidate(outcome):
+            await score_resume(outcome)
+
+    async def settle_duplicates(original):
+        # Copies follow a scored or not-shortlisted original. If the original could not be scored, the earliest
+        # uploaded copy left is promoted and scored in its place.
+        pending = sorted(duplicates[original.index], key=lambda outcome: outcome.index)
+        while pending and original.status not in (SCORED, NOT_SHORTLISTED):
+            original, pending = pending[0], pending[1:]
+            original.duplicate_of = None
+            run.candidate_count += 1
+            run.shortlisted_count += 1
+            await score_resume(original)
+        if not pending:
+            return
+        if pending[0].index < original.index:
+            # Extraction finishes in any order, so the copy scored may not be the first uploaded; relabel the two.
+            first, pending = pending[0], [original] + pending[1:]
+            first.result, first.duplicate_of, original.result = original.result, None, None
+            finish(first, original.status, original.error)
+            original = first
+        for outcome in pending:
+            outcome.duplicate_of = original.name
+            finish(outcome, DUPLICATE if original.status == SCORED else NOT_SHORTLISTED, f"duplicate of {original.name}")
+
+    def is_candidate(outcome):
+        return not outcome.status and outcome.duplicate_of is None
+
+    resumes = list(resumes)
+    started = time.perf_counter()
+    run = AnalysisRun(outcomes=[ResumeOutcome(index, name) for index, (name, _) in enumerate(resumes, 1)], local_only=local_only)
+    duplicates = {}
+    try:
+        if local_only or prerank_top_k or resumes_per_request > 1:
+            await asyncio.gather(*(prepare_resume(outcome, data) for outcome, (_, data) in zip(run.outcomes, resumes)))
+            candidates = [outcome for outcome in run.outcomes if is_candidate(outcome)]
+            with timed(run.timings, "rank"):
+                scores, tf = rank_resumes([outcome.text for outcome in candidates], prepared_jd.terms, keyword_filter)
+            run.candidate_count = len(candidates)
+            if local_only:
+                for row, outcome in enumerate(candidates):
+                    await apply_result(outcome, ScreeningResult.from_response(local_analysis(outcome.text, prepared_jd.terms, tf[row])))
+            else:
+                selected = shortlist(scores, prerank_top_k)
+                selected_rows = set(selected)
+                for row, outcome in enumerate(candidates):
+                    if row not in selected_rows:
+                        finish(outcome, NOT_SHORTLISTED)
+                run.shortlisted_count = len(selected)
+                await score_resumes([candidates[row] for row in selected])
+        else:
+            await asyncio.gather(*(prepare_and_score(outcome, data) for outcome, (_, data) in zip(run.outcomes, resumes)))
+            run.candidate_count = run.shortlisted_count = sum(outcome.status not in ("", EXTRACTION_FAILED, NO_TEXT, MISSING_MUST_HAVE, MISSING_GOOD_TO_HAVE, DUPLICATE) for outcome in run.outcomes)
+        await asyncio.gather(*(settle_duplicates(run.outcomes[index - 1]) for index in duplicates))
+    finally:
+        if owns_pool:
+            extraction_pool.shutdown()
+    run.timings["total"] = time.perf_counter() - started
+    return run
@@ -0,0 +1,113 @@
+import heapq
+import os
+import re
+
+import numpy as np
+
+PRERANK_TOP_K = int(os.getenv("PRERANK_TOP_K", "0"))
+BM25_K1 = 1.5
+BM25_B = 0.75
+MUST_HAVE_BOOST = 2.0
+GOOD_TO_HAVE_BOOST = 1.0
+LOCAL_KEYWORD_LIMIT = 10
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing
+during each etc for from further had has have having he her here hers him his how i if in into is it its
+itself job just may me more most must my no nor not now of off on once only or other our ours out over own
+per please role same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we well were what when where which while who whom why will
+with within would you your yours work working team teams experience years year looking candidate ability
+strong good excellent skills skill knowledge required requirements responsibilities preferred plus using
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+YEARS_PATTERN = re.compile(r"(\d{1,2})\s*\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS and len(token) > 1]
+
+
+def jd_terms(jd):
+    return list(dict.fromkeys(tokenize(jd)))
+
+
+def term_frequencies(texts, terms):
+    # Dense (n_resumes x n_jd_terms) count matrix; only JD terms matter for BM25, so it stays small.
+    column = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(texts), len(terms)), dtype=np.float32)
+    doc_lengths = np.zeros(len(texts), dtype=np.float32)
+    for i, text in enumerate(texts):
+        tokens = tokenize(text)
+        doc_lengths[i] = len(tokens)
+        for token in tokens:
+            if (j := column.get(token)) is not None:
+                tf[i, j] += 1
+    return tf, doc_lengths
+
+
+def bm25_scores(tf, doc_lengths):
+    n_docs = tf.shape[0]
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+    avg_length = doc_lengths.mean() if n_docs and doc_lengths.mean() > 0 else 1.0
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / avg_length)
+    return (tf * (BM25_K1 + 1) / (tf + norm[:, None])) @ idf
+
+
+def keyword_boosts(texts, keyword_filter):
+    boosts = np.zeros(len(texts), dtype=np.float32)
+    for i, text in enumerate(texts):
+        found = keyword_filter.matcher.find(text)
+        boosts[i] = (MUST_HAVE_BOOST * sum(kw in found for kw in keyword_filter.must_have)
+                     + GOOD_TO_HAVE_BOOST * sum(kw in found for kw in keyword_filter.good_to_have))
+    return boosts
+
+
+def rank_resumes(texts, terms, keyword_filter):
+    tf, doc_lengths = term_frequencies(texts, terms)
+    return bm25_scores(tf, doc_lengths) + keyword_boosts(texts, keyword_filter), tf
+
+
+def shortlist(scores, k):
+    order = np.argsort(-scores, kind="stable")
+    return order[:k].tolist() if k else order.tolist()
+
+
+def local_analysis(text, terms, tf_row):
+    # Plain JD-term coverage, so a resume's local score does not depend on the rest of the upload.
+    present = tf_row > 0
+    match = round(100 * int(present.sum()) / len(terms)) if terms else 0
+    matching = [term for term, hit in zip(terms, present) if hit]
+    missing = [term for term, hit in zip(terms, present) if not hit]
+    strengths = [terms[j] for j in np.argsort(-tf_row, kind="stable") if present[j]]
+    years = [int(value) for value in YEARS_PATTERN.findall(text)]
+    return {
+        "##JD Match": f"{match}%",
+        "##Missing Keywords": missing[:LOCAL_KEYWORD_LIMIT],
+        "##Matching Keywords": matching[:LOCAL_KEYWORD_LIMIT],
+        "##Profile Summary": "Scored locally by keyword relevance; no AI summary was generated.",
+        "##Years of Experience": f"{max(years)} years" if years else "N/A",
+        "##Key Skill Strengths": strengths[:5],
+    }
+
+
+# Bounded min-heap of the best `size` items seen so far, so a live top-N never needs a full re-sort.
+class Leaderboard:
+    def __init__(self, size, key):
+        self.size = size
+        self.key = key
+        self.heap = []
+        self.pushed = 0
+
+    def push(self, item):
+        entry = (self.key(item), self.pushed, item)
+        self.pushed += 1
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, entry)
+        elif entry[0] > self.heap[0][0]:
+            heapq.heapreplace(self.heap, entry)
+
+    def top(self):
+        return [item for _, _, item in sorted(self.heap, key=lambda entry: entry[0], reverse=True)]
@@ -0,0 +1,128 @@
+import json
+import re
+from dataclasses import dataclass, field
+
+PERCENT_PATTERN = re.compile(r"\s*(\d+(?:\.\d+)?)\s*%?\s*")
+NUMBER_PATTERN = re.compile(r"-?\d+(?:\.\d+)?")
+JSON_TOKEN_PATTERN = re.compile(r'[\[\]{}"\\]')
+
+
+def parse_percentage(value):
+    # Strict: a bare number or "NN%" / "NN.N %" between 0 and 100, anything else is rejected.
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    elif isinstance(value, str) and (match := PERCENT_PATTERN.fullmatch(value)):
+        number = float(match.group(1))
+    else:
+        return None
+    return number if 0 <= number <= 100 else None
+
+
+def parse_years(value):
+    # "5 years", "5+ yrs", "3.5" -> 5.0 / 5.0 / 3.5; negative numbers, "N/A" and other text without a number -> None.
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if value >= 0 else None
+    if isinstance(value, str) and (match := NUMBER_PATTERN.search(value)):
+        return None if match.group().startswith("-") else float(match.group())
+    return None
+
+
+def _string_list(value):
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    if isinstance(value, list):
+        return [str(item) for item in value if item is not None and str(item).strip()]
+    return []
+
+
+@dataclass(slots=True)
+class ScreeningResult:
+    match: float
+    years_of_experience: float | None = None
+    missing_keywords: list = field(default_factory=list)
+    matching_keywords: list = field(default_factory=list)
+    profile_summary: str = ""
+    key_skill_strengths: list = field(default_factory=list)
+
+    @classmethod
+    def from_response(cls, response):
+        # Validates a "##"-keyed model response; returns None unless it has a usable match score.
+        if not isinstance(response, dict) or (match := parse_percentage(response.get("##JD Match"))) is None:
+            return None
+        summary = response.get("##Profile Summary")
+        return cls(
+            match=match,
+            years_of_experience=parse_years(response.get("##Years of Experience")),
+            missing_keywords=_string_list(response.get("##Missing Keywords")),
+            matching_keywords=_string_list(response.get("##Matching Keywords")),
+            profile_summary=summary.strip() if isinstance(summary, str) else "",
+            key_skill_strengths=_string_list(response.get("##Key Skill Strengths")),
+        )
+
+    def to_response(self):
+        # The "##"-keyed dict the dashboard, CLI and job store work with, with normalized values.
+        return {
+            "##JD Match": f"{self.match:g}%",
+            "##Missing Keywords": self.missing_keywords,
+            "##Matching Keywords": self.matching_keywords,
+            "##Profile Summary": self.profile_summary or "N/A",
+            "##Years of Experience": f"{self.years_of_experience:g} years" if self.years_of_experience is not None else "N/A",
+            "##Key Skill Strengths": self.key_skill_strengths,
+        }
+
+
+# Finds where the first top-level JSON value in a growing buffer ends, in one pass over the text: each feed()
+# resumes from where the previous one stopped, and brackets inside strings are ignored. Prose or code fences
+# around the JSON are skipped, so a streamed answer can be cut off as soon as the value closes.
+class JSONScanner:
+    def __init__(self, openers="{"):
+        self.openers = openers
+        self.start = None
+        self.end = None
+        self.depth = 0
+        self.pos = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, text):
+        if self.end is not None:
+            return True
+        pos = self.pos
+        if self.escaped and pos < len(text):
+            pos, self.escaped = pos + 1, False
+        while not self.escaped and (match := JSON_TOKEN_PATTERN.search(text, pos)):
+            char, pos = match.group(), match.end()
+            if self.start is None:
+                if char in self.openers:
+                    self.start, self.depth = match.start(), 1
+            elif self.in_string:
+                if char == "\\":
+                    if pos < len(text):
+                        pos += 1
+                    else:
+                        self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = self.pos = pos
+                    return True
+        self.pos = len(text)
+        return False
+
+    def value(self, text):
+        if not self.feed(text):
+            return None
+        try:
+            return json.loads(text[self.start:self.end])
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,62 @@
+import pytest
+
+from accounts import AccountStore, hash_password, verify_password
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AccountStore(str(tmp_path / "accounts.sqlite3"))
+
+
+def test_password_round_trip():
+    stored = hash_password("s3cret")
+    assert verify_password("s3cret", stored)
+    assert not verify_password("wrong", stored)
+    assert not verify_password("s3cret", "not-a-hash")
+
+
+def test_create_user_rejects_taken_username(store):
+    assert store.create_user("alice", "alice@example.com", "pw")
+    assert not store.create_user("alice", "other@example.com", "pw2")
+    assert store.authenticate("alice", "pw")
+    assert not store.authenticate("alice", "pw2")
+
+
+def test_reserve_stops_at_the_limit(store):
+    assert store.reserve("alice", "job-1", 6, limit=10)
+    assert store.reserve("alice", "job-2", 4, limit=10)
+    assert not store.reserve("alice", "job-3", 1, limit=10)
+    assert store.usage("alice") == 10
+
+
+def test_failed_reserve_holds_nothing(store):
+    assert not store.reserve("alice", "job-1", 11, limit=10)
+    assert store.usage("alice") == 0
+    # The job id was not recorded, so it can still be reserved.
+    assert store.reserve("alice", "job-1", 10, limit=10)
+
+
+def test_reserve_without_limit(store):
+    assert store.reserve("alice", "job-1", 1000)
+    assert store.usage("alice") == 1000
+
+
+def test_settle_refunds_unused_resumes_once(store):
+    store.reserve("alice", "job-1", 8, limit=10)
+    store.settle("job-1", 3)
+    assert store.usage("alice") == 3
+    store.settle("job-1", 0)
+    assert store.usage("alice") == 3
+
+
+def test_finish_analysis_records_history_and_settles(store):
+    from results import ScreeningResult
+
+    store.reserve("alice", "job-1", 5, limit=10)
+    store.finish_analysis("alice", "job-1", "jd", [("h1", "a.pdf", ScreeningResult(80)), ("h2", "b.pdf", ScreeningResult(60))])
+    assert store.usage("alice") == 2
+    store.settle("job-1", 0)
+    assert store.usage("alice") == 2
+    history = store.history(owner="alice")
+    assert [row["resume_name"] for row in history] == ["a.pdf", "b.pdf"]
+    assert history[0]["response"]["##JD Match"] == "80%"
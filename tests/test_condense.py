@@ -0,0 +1,36 @@
+from condense import condense_resume, normalize_resume_text
+
+
+def test_keeps_repeated_body_lines():
+    text = "Senior Software Engineer\nBuilt 3 web pages for client\nSenior Software Engineer\nBuilt 5 web pages for client"
+    assert normalize_resume_text(text) == text
+
+
+def test_drops_running_headers_footers_and_page_numbers_at_page_edges():
+    pages = [
+        "Jane Doe | Page 1 of 2\nExperience\nBuilt APIs\nconfidential\n1",
+        "Jane Doe | Page 2 of 2\nSkills\nPython\nconfidential\n2",
+    ]
+    assert normalize_resume_text("\f".join(pages)).split("\n") == [
+        "Jane Doe | Page 1 of 2", "Experience", "Built APIs", "confidential", "Skills", "Python",
+    ]
+
+
+def test_hyphenated_line_breaks():
+    assert normalize_resume_text("state-of-the-\nart engin-\neering Python-\nBased") == "state-of-the-art engineering Python-Based"
+
+
+def test_collapses_whitespace_and_blank_runs():
+    assert normalize_resume_text("  a \t b \r\n\n\n\nc  ") == "a b\n\nc"
+
+
+def test_condense_keeps_opening_and_relevant_sections_within_budget():
+    text = "\n".join([
+        "Jane Doe", "jane@example.com", "",
+        "Hobbies", *["chess and hiking every weekend"] * 20, "",
+        "Experience", *["python sql data pipelines"] * 20,
+    ])
+    condensed, before, after = condense_resume(text, ["python", "sql"], token_budget=60)
+    assert condensed.startswith("Jane Doe")
+    assert "python sql" in condensed and "chess" not in condensed
+    assert after <= 60 < before
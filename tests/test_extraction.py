@@ -0,0 +1,89 @@
+import asyncio
+import io
+import os
+import signal
+import time
+
+import pytest
+from docx import Document
+
+import extraction
+from extraction import ExtractionPool, _extract_in_worker, extract_text
+
+
+def docx_bytes(paragraphs):
+    doc = Document()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class FakePage:
+    def __init__(self, text, parsed):
+        self.text = text
+        self.parsed = parsed
+
+    def extract_text(self):
+        self.parsed.append(self.text)
+        return self.text
+
+
+def fake_reader(page_texts, parsed):
+    class FakeReader:
+        def __init__(self, stream):
+            self.pages = [FakePage(text, parsed) for text in page_texts]
+
+    return FakeReader
+
+
+def test_docx_text_stops_at_the_character_cap():
+    data = docx_bytes(["a" * 40, "", "b" * 40, "c" * 40])
+    assert extract_text("resume.docx", data, max_chars=60) == "a" * 40 + "\n" + "b" * 20
+
+
+def test_pdf_pages_past_the_caps_are_never_parsed(monkeypatch):
+    parsed = []
+    monkeypatch.setattr(extraction.PyPDF2, "PdfReader", fake_reader(["one", "two", "three", "four"], parsed))
+    assert extract_text("resume.pdf", b"", max_pages=3) == "one\ftwo\fthree"
+    assert parsed == ["one", "two", "three"]
+    del parsed[:]
+    assert extract_text("resume.pdf", b"", max_chars=5) == "one\ftw"
+    assert parsed == ["one", "two"]
+
+
+@pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs SIGALRM")
+def test_stuck_parser_is_interrupted(monkeypatch):
+    def stuck(file_name, data):
+        while True:
+            try:
+                time.sleep(1)
+            except Exception:
+                pass
+
+    monkeypatch.setattr(extraction, "extract_text", stuck)
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        _extract_in_worker("resume.pdf", b"", 0.2)
+    assert time.perf_counter() - started < 2
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+def test_pool_is_rebuilt_after_a_worker_dies():
+    pool = ExtractionPool(max_workers=1)
+    data = docx_bytes(["python developer"])
+
+    async def run():
+        assert await pool.extract("resume.docx", data) == "python developer"
+        broken = pool.executor
+        for process in list(broken._processes.values()):
+            os.kill(process.pid, signal.SIGKILL)
+        timings = {}
+        assert await pool.extract("resume.docx", data, timings) == "python developer"
+        assert pool.executor is not broken and timings["extract"] >= 0
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,28 @@
+from jd import normalize_jd_text, prepare_jd
+
+
+def test_normalize_collapses_whitespace_and_blank_lines():
+    jd = "  Senior   Python\tdeveloper  \n\n\n\n  Django and SQL \n"
+    assert normalize_jd_text(jd) == "Senior Python developer\n\nDjango and SQL"
+    assert normalize_jd_text("x" * 50, max_chars=10) == "x" * 10
+
+
+def test_formatting_changes_keep_the_same_digest():
+    first = prepare_jd("Python developer\n\n\n\nSQL")
+    second = prepare_jd("  Python   developer \n\nSQL  ")
+    assert first.text == second.text and first.digest == second.digest
+    assert prepare_jd("Go developer\n\nSQL").digest != first.digest
+
+
+def test_prepared_jd_is_computed_once_per_requisition():
+    first = prepare_jd("Data engineer: Spark, Airflow", "Spark", "Airflow, dbt")
+    assert prepare_jd("Data engineer: Spark, Airflow", "Spark", "Airflow, dbt") is first
+    assert prepare_jd("Data engineer: Spark, Airflow", "Spark") is not first
+
+
+def test_prepared_jd_carries_terms_and_keyword_filter():
+    prepared = prepare_jd("Python developer with Django and Python scripting", "Django", "AWS, GCP")
+    assert prepared.terms == ("python", "developer", "django", "scripting")
+    assert prepared.keyword_filter.must_have == ["django"]
+    assert prepared.keyword_filter.check("Python and Django on GCP") is None
+    assert prepared.keyword_filter.check("Python on GCP") == "must_have"
@@ -0,0 +1,165 @@
+import sqlite3
+import time
+
+import pytest
+
+from accounts import AccountStore
+from cache import ResultCache
+from dedup import DuplicateIndex, fingerprint_text
+from jobs import DONE, FAILED, JobManager, JobStore
+from pipeline import DUPLICATE, SCORED, ResumeOutcome
+from results import ScreeningResult
+
+RESUMES = [("a.txt", b"python sql developer"), ("b.txt", b"java developer"), ("c.txt", b"go developer")]
+
+
+class FakeExtractionPool:
+    async def extract(self, file_name, data, timings=None):
+        return data.decode()
+
+    def shutdown(self):
+        pass
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def test_only_one_worker_claims_an_expired_job(store):
+    now = time.time()
+    store.create_job("alice", RESUMES, "jd", {}, "orphaned", "dead-worker", now - 1)
+    store.create_job("alice", RESUMES, "jd", {}, "leased", "live-worker", now + 60)
+    store.create_job("alice", RESUMES, "jd", {}, "unleased")
+    assert store.claimable_jobs(now) == ["orphaned", "unleased"]
+    assert store.claim_job("orphaned", "worker-1", now, now + 60)
+    assert not store.claim_job("orphaned", "worker-2", now, now + 60)
+    assert not store.claim_job("leased", "worker-2", now, now + 60)
+    assert store.claimable_jobs(now) == ["unleased"]
+
+
+def test_renew_leases_only_touches_the_given_jobs(store):
+    now = time.time()
+    store.create_job("alice", RESUMES, "jd", {}, "kept", "worker", now + 1)
+    store.create_job("alice", RESUMES, "jd", {}, "dropped", "worker", now + 1)
+    store.renew_leases("worker", ["kept"], now + 60)
+    assert store.claimable_jobs(now + 30) == ["dropped"]
+
+
+def test_finished_jobs_are_not_claimable(store):
+    store.create_job("alice", RESUMES, "jd", {}, "job")
+    store.finish_job("job", DONE)
+    assert store.claimable_jobs(time.time()) == []
+    assert store.pending_resumes("job") == [(1, "a.txt", None), (2, "b.txt", None), (3, "c.txt", None)]
+
+
+def test_resumed_job_only_gets_unsaved_resumes(store):
+    store.create_job("alice", RESUMES, "jd", {}, "job")
+    store.save_outcomes("job", [(2, ResumeOutcome(1, "b.txt", SCORED, result=ScreeningResult(70)))])
+    assert [idx for idx, _, _ in store.pending_resumes("job")] == [1, 3]
+    assert store.get_job("job")["completed"] == 1
+    assert [outcome.status for outcome in store.outcomes("job")] == ["", SCORED, ""]
+
+
+@pytest.fixture
+def make_manager(tmp_path):
+    accounts = AccountStore(str(tmp_path / "accounts.sqlite3"))
+
+    def make(store, **options):
+        return JobManager(store, None, ResultCache(str(tmp_path / "cache.sqlite3")), FakeExtractionPool(),
+                          DuplicateIndex(str(tmp_path / "duplicates.sqlite3")), accounts, **options)
+
+    return make, accounts
+
+
+def submit(manager, accounts):
+    job_id = "job-1"
+    assert accounts.reserve("alice", job_id, len(RESUMES), limit=10)
+    manager.submit("alice", RESUMES, "python sql", job_id, local_only=True)
+    return job_id
+
+
+def wait_for_end(manager, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get_job(job_id)
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job still {job['status']}")
+
+
+def test_job_runs_and_settles(store, make_manager):
+    make, accounts = make_manager
+    manager = make(store)
+    job = wait_for_end(manager, submit(manager, accounts))
+    assert job["status"] == DONE and job["completed"] == 3
+    assert accounts.usage("alice") == 3
+
+
+def test_failed_save_is_retried(store, make_manager, monkeypatch):
+    make, accounts = make_manager
+    save_outcomes = store.save_outcomes
+    failures = []
+
+    def flaky_save(job_id, outcomes):
+        if not failures:
+            failures.append(job_id)
+            raise sqlite3.OperationalError("database is locked")
+        save_outcomes(job_id, outcomes)
+
+    monkeypatch.setattr(store, "save_outcomes", flaky_save)
+    manager = make(store)
+    job = wait_for_end(manager, submit(manager, accounts))
+    assert failures and job["status"] == DONE and job["completed"] == 3
+
+
+def test_job_that_cannot_save_fails_and_settles(store, make_manager, monkeypatch):
+    make, accounts = make_manager
+
+    def broken_save(job_id, outcomes):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "save_outcomes", broken_save)
+    manager = make(store)
+    job = wait_for_end(manager, submit(manager, accounts))
+    assert job["status"] == FAILED and "database is locked" in job["error"]
+    assert accounts.usage("alice") == 0
+    # The job is dropped from active_jobs (and so stops being renewed) right after its status is written.
+    deadline = time.time() + 5
+    while manager.active_jobs and time.time() < deadline:
+        time.sleep(0.01)
+    assert manager.active_jobs == set()
+
+
+def test_job_is_resumed_after_its_lease_runs_out(store, make_manager, monkeypatch):
+    make, accounts = make_manager
+    finish_job = store.finish_job
+    failures = []
+
+    def flaky_finish(*args):
+        if not failures:
+            failures.append(args)
+            raise sqlite3.OperationalError("disk I/O error")
+        finish_job(*args)
+
+    monkeypatch.setattr(store, "finish_job", flaky_finish)
+    manager = make(store, lease_seconds=0.3)
+    job = wait_for_end(manager, submit(manager, accounts))
+    assert failures and job["status"] == DONE
+    assert accounts.usage("alice") == 3
+
+
+def test_copy_of_a_resume_scored_before_a_restart_is_a_duplicate(store, make_manager):
+    make, accounts = make_manager
+    resumes = [("a.txt", b"python sql developer"), ("copy.txt", b"python sql developer"), ("b.txt", b"java developer")]
+    store.create_job("alice", resumes, "python sql", {"local_only": True}, "job-1", "dead-worker", time.time() - 1)
+    first = ResumeOutcome(1, "a.txt", SCORED, fingerprint=fingerprint_text("python sql developer"), result=ScreeningResult(70))
+    store.save_outcomes("job-1", [(1, first)])
+    assert accounts.reserve("alice", "job-1", len(resumes), limit=10)
+    manager = make(store, lease_seconds=0.3)
+    assert wait_for_end(manager, "job-1")["status"] == DONE
+    assert [(outcome.status, outcome.error) for outcome in store.outcomes("job-1")] == [
+        (SCORED, None), (DUPLICATE, "duplicate of a.txt"), (SCORED, None),
+    ]
+    assert [name for _, name, _ in store.scored_resumes("job-1")] == ["a.txt", "b.txt"]
@@ -0,0 +1,34 @@
+from keywords import KeywordFilter, KeywordMatcher, parse_keywords
+
+
+def test_parse_keywords():
+    assert parse_keywords(" Python, SQL ,, machine learning ") == ["Python", "SQL", "machine learning"]
+    assert parse_keywords("") == []
+    assert parse_keywords(None) == []
+
+
+def test_matcher_respects_word_boundaries_and_symbols():
+    matcher = KeywordMatcher(["C++", ".NET", "Java", "machine  learning"])
+    found = matcher.find("Built C++ and .NET services; JavaScript front end; Machine\nLearning pipelines")
+    assert found == {"c++", ".net", "machine learning"}
+
+
+def test_matcher_without_keywords():
+    assert KeywordMatcher([]).find("anything") == set()
+
+
+def test_filter_requires_every_must_have():
+    keyword_filter = KeywordFilter(["Python", "SQL"], [])
+    assert keyword_filter.check("python and sql") is None
+    assert keyword_filter.check("python only") == "must_have"
+
+
+def test_filter_requires_one_good_to_have():
+    keyword_filter = KeywordFilter(["Python"], ["AWS", "GCP"])
+    assert keyword_filter.check("Python on GCP") is None
+    assert keyword_filter.check("Python on Azure") == "good_to_have"
+    assert keyword_filter.check("Go on AWS") == "must_have"
+
+
+def test_filter_without_keywords_passes_everything():
+    assert KeywordFilter([], []).check("") is None
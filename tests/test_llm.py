@@ -0,0 +1,90 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+from openai.types.responses import ResponseTextDeltaEvent
+
+import llm
+from llm import RETRY_MAX_DELAY, RateLimiter, _retry_delay, run_agent
+
+
+def rate_limit_error(retry_after=None):
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "https://model.test/chat/completions"))
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+class FakeRunner:
+    # Fails the first `failures` calls with a 429, then streams `chunks`.
+    def __init__(self, failures, chunks, retry_after="0"):
+        self.failures = failures
+        self.chunks = chunks
+        self.retry_after = retry_after
+        self.calls = 0
+        self.cancelled = False
+
+    def run_streamed(self, starting_agent, input):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise rate_limit_error(self.retry_after)
+        return self
+
+    async def stream_events(self):
+        for chunk in self.chunks:
+            yield SimpleNamespace(type="raw_response_event", data=ResponseTextDeltaEvent.model_construct(delta=chunk))
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def run(runner, monkeypatch, **options):
+    monkeypatch.setattr(llm, "Runner", runner)
+    return asyncio.run(run_agent(None, "resume", asyncio.Semaphore(1), RateLimiter(rate=1000, capacity=10), **options))
+
+
+def test_rate_limiter_allows_a_burst_then_paces_calls():
+    limiter = RateLimiter(rate=20, capacity=2)
+
+    async def acquire(count):
+        started = time.monotonic()
+        for _ in range(count):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    async def scenario():
+        return await acquire(2), await acquire(2)
+
+    burst, paced = asyncio.run(scenario())
+    assert burst < 0.05
+    assert 0.09 <= paced < 0.5
+
+
+def test_retry_delay_honours_retry_after():
+    assert _retry_delay(rate_limit_error("2"), attempt=0) == 2
+    assert _retry_delay(rate_limit_error("3600"), attempt=0) == RETRY_MAX_DELAY
+    delay = _retry_delay(rate_limit_error(), attempt=1)
+    assert llm.RETRY_BASE_DELAY * 2 <= delay <= llm.RETRY_BASE_DELAY * 3
+
+
+def test_rate_limited_call_is_retried(monkeypatch):
+    runner = FakeRunner(failures=2, chunks=['{"##JD Match": ', '"80%"}'])
+    timings = {}
+    assert run(runner, monkeypatch, timings=timings) == '{"##JD Match": "80%"}'
+    assert runner.calls == 3
+    assert set(timings) == {"model", "model_wait"}
+
+
+def test_rate_limit_error_is_raised_once_retries_run_out(monkeypatch):
+    runner = FakeRunner(failures=5, chunks=[])
+    with pytest.raises(RateLimitError):
+        run(runner, monkeypatch, max_retries=2)
+    assert runner.calls == 3
+
+
+def test_stream_stops_after_the_first_json_value(monkeypatch):
+    runner = FakeRunner(failures=0, chunks=['{"a": 1}', " and some more text"])
+    assert run(runner, monkeypatch, stop_after_json="{") == '{"a": 1} and some more text'
+    assert runner.cancelled
@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import pytest
+
+import pipeline
+from cache import ResultCache
+from dedup import DuplicateIndex
+from pipeline import DUPLICATE, MODEL_FAILED, NOT_SHORTLISTED, SCORED, analyze_resumes, parse_result, split_batch_response
+from results import ScreeningResult
+
+
+def test_parse_result_from_fenced_response():
+    assert parse_result('```json\n{"##JD Match": "70%"}\n```') == ScreeningResult(70.0)
+    assert parse_result("no json here") is None
+
+
+def test_split_batch_response():
+    response = json.dumps([
+        {"resume_id": "R1", "##JD Match": "80%"},
+        {"resume_id": "R2", "##JD Match": "not a number"},
+        {"resume_id": "R9", "##JD Match": "50%"},
+        "junk",
+    ])
+    assert split_batch_response(response, {"R1", "R2"}) == {"R1": ScreeningResult(80.0)}
+
+
+def test_split_batch_response_accepts_a_wrapping_object():
+    response = json.dumps({"results": [{"resume_id": "R1", "##JD Match": 40}]})
+    assert split_batch_response(response, {"R1"}) == {"R1": ScreeningResult(40.0)}
+    assert split_batch_response('{"results": "none"}', {"R1"}) == {}
+
+
+class FakeExtractionPool:
+    # Returns the uploaded bytes as text, finishing each file after the given delay.
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+
+    async def extract(self, file_name, data, timings=None):
+        await asyncio.sleep(self.delays.get(file_name, 0))
+        return data.decode()
+
+    def shutdown(self):
+        pass
+
+
+class FakeAgent:
+    instructions = "instructions"
+
+    class model:
+        model = "fake-model"
+
+    def clone(self, **kwargs):
+        return self
+
+
+@pytest.fixture
+def run_analysis(tmp_path, monkeypatch):
+    async def fake_run_agent(agent, resume_input, *args, **kwargs):
+        if "FAIL" in resume_input:
+            raise RuntimeError("model unavailable")
+        return '{"##JD Match": "80%"}'
+
+    monkeypatch.setattr(pipeline, "run_agent", fake_run_agent)
+
+    def run(resumes, delays=None, **options):
+        options.setdefault("result_cache", ResultCache(str(tmp_path / "cache.sqlite3")))
+        options.setdefault("duplicate_index", DuplicateIndex(str(tmp_path / "duplicates.sqlite3")))
+        return asyncio.run(analyze_resumes(
+            [(name, text.encode()) for name, text in resumes], "Python SQL developer", agent=FakeAgent(),
+            extraction_pool=FakeExtractionPool(delays), **options,
+        ))
+
+    return run
+
+
+RESUME = "Python developer " + " ".join(f"built service{i} with python and sql" for i in range(40))
+
+
+def statuses(run):
+    return [(outcome.name, outcome.status, outcome.duplicate_of) for outcome in run.outcomes]
+
+
+def test_first_uploaded_copy_is_the_original(run_analysis):
+    run = run_analysis([("first.pdf", RESUME), ("second.pdf", RESUME)], delays={"first.pdf": 0.1})
+    assert statuses(run) == [("first.pdf", SCORED, None), ("second.pdf", DUPLICATE, "first.pdf")]
+    assert run.duplicate_count == 1
+
+
+def test_slow_extraction_does_not_hold_back_later_resumes(run_analysis):
+    reported = []
+    run = run_analysis([("slow.pdf", RESUME), ("other.pdf", "Java developer " * 30), ("copy.pdf", RESUME)],
+                       delays={"slow.pdf": 0.2}, on_outcome=lambda outcome: reported.append((outcome.name, outcome.status)))
+    assert reported[:2] == [("other.pdf", SCORED), ("copy.pdf", SCORED)]
+    # The copy was scored first, but the earlier upload is reported as the original.
+    assert statuses(run) == [("slow.pdf", SCORED, None), ("other.pdf", SCORED, None), ("copy.pdf", DUPLICATE, "slow.pdf")]
+    assert reported[-2:] == [("slow.pdf", SCORED), ("copy.pdf", DUPLICATE)]
+
+
+def test_copy_is_scored_when_the_original_fails(run_analysis):
+    run = run_analysis([("first.pdf", RESUME + " FAIL"), ("second.pdf", RESUME), ("third.pdf", RESUME)])
+    assert statuses(run) == [
+        ("first.pdf", MODEL_FAILED, None), ("second.pdf", SCORED, None), ("third.pdf", DUPLICATE, "second.pdf"),
+    ]
+
+
+def test_copy_of_a_resume_left_off_the_shortlist(run_analysis):
+    strong = "Python SQL developer " * 40
+    run = run_analysis([("strong.pdf", strong), ("first.pdf", RESUME), ("second.pdf", RESUME)], prerank_top_k=1)
+    assert statuses(run) == [
+        ("strong.pdf", SCORED, None), ("first.pdf", NOT_SHORTLISTED, None), ("second.pdf", NOT_SHORTLISTED, "first.pdf"),
+    ]
+
+
+def test_cache_counts_are_per_run(run_analysis):
+    first = run_analysis([("a.pdf", RESUME)])
+    second = run_analysis([("b.pdf", "Java developer " * 30), ("c.pdf", "Go developer " * 30)])
+    assert (first.cache_hits, first.cache_misses) == (0, 1)
+    assert (second.cache_hits, second.cache_misses) == (0, 2)
+
+
+def test_broken_cache_and_index_do_not_fail_the_run(run_analysis, tmp_path):
+    result_cache = ResultCache(str(tmp_path / "broken-cache.sqlite3"))
+    duplicate_index = DuplicateIndex(str(tmp_path / "broken-duplicates.sqlite3"))
+    for store, tables in ((result_cache, ("results",)), (duplicate_index, ("buckets", "resumes"))):
+        for table in tables:
+            store.conn.execute(f"DROP TABLE {table}")
+    run = run_analysis([("a.pdf", RESUME), ("b.pdf", "Java developer " * 30)],
+                       result_cache=result_cache, duplicate_index=duplicate_index)
+    assert [outcome.status for outcome in run.outcomes] == [SCORED, SCORED]
+    assert (run.cache_hits, run.cache_misses) == (0, 2)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from keywords import KeywordFilter
+from ranking import Leaderboard, jd_terms, local_analysis, rank_resumes, shortlist, term_frequencies, tokenize
+
+JD = "Senior Python developer with Django, PostgreSQL and AWS experience. C++ is a plus."
+
+
+def test_tokenize_drops_stopwords_and_keeps_symbols():
+    assert tokenize("The candidate knows C++, Node.js and C# with 5 years of experience") == [
+        "knows", "c++", "node.js", "c#",
+    ]
+    assert jd_terms("python, Python and SQL") == ["python", "sql"]
+
+
+def test_relevant_resumes_rank_first():
+    texts = [
+        "Java developer with Spring and Oracle",
+        "Python developer: Django, PostgreSQL, AWS, C++",
+        "Python developer doing data analysis",
+    ]
+    scores, tf = rank_resumes(texts, jd_terms(JD), KeywordFilter([], []))
+    assert tf.shape == (3, len(jd_terms(JD)))
+    assert shortlist(scores, 0) == [1, 2, 0]
+
+
+def test_must_have_keywords_boost_the_score():
+    texts = ["Python developer with AWS", "Python developer with Azure"]
+    plain, _ = rank_resumes(texts, jd_terms(JD), KeywordFilter([], []))
+    boosted, _ = rank_resumes(texts, jd_terms(JD), KeywordFilter(["AWS"], []))
+    assert boosted[0] - plain[0] > boosted[1] - plain[1]
+
+
+def test_shortlist_keeps_upload_order_on_ties():
+    scores = np.array([1.0, 3.0, 1.0, 3.0, 2.0])
+    assert shortlist(scores, 3) == [1, 3, 4]
+    assert shortlist(scores, 0) == [1, 3, 4, 0, 2]
+    assert shortlist(np.array([]), 5) == []
+
+
+def test_local_analysis_scores_jd_term_coverage():
+    terms = jd_terms("python django aws kubernetes")
+    text = "Python and Django developer, python since 2015. 3 years AWS, 7+ years backend."
+    tf, _ = term_frequencies([text], terms)
+    analysis = local_analysis(text, terms, tf[0])
+    assert analysis["##JD Match"] == "75%"
+    assert analysis["##Matching Keywords"] == ["python", "django", "aws"]
+    assert analysis["##Missing Keywords"] == ["kubernetes"]
+    assert analysis["##Key Skill Strengths"][0] == "python"
+    assert analysis["##Years of Experience"] == "7 years"
+
+
+def test_local_analysis_without_jd_terms():
+    analysis = local_analysis("anything", [], np.zeros(0))
+    assert analysis["##JD Match"] == "0%" and analysis["##Years of Experience"] == "N/A"
+
+
+def test_leaderboard_keeps_the_best_items():
+    leaderboard = Leaderboard(3, key=lambda item: item[1])
+    for item in [("a", 50), ("b", 90), ("c", 10), ("d", 70), ("e", 90)]:
+        leaderboard.push(item)
+    assert [name for name, _ in leaderboard.top()] == ["b", "e", "d"]
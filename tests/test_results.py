@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from results import JSONScanner, ScreeningResult, parse_percentage, parse_years
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("75%", 75.0),
+    (" 75.5 % ", 75.5),
+    ("80", 80.0),
+    (80, 80.0),
+    (0, 0.0),
+    (100.0, 100.0),
+    ("101%", None),
+    ("-5%", None),
+    (-1, None),
+    ("75 percent", None),
+    ("about 75%", None),
+    ("", None),
+    (None, None),
+    (True, None),
+    ([75], None),
+])
+def test_parse_percentage(value, expected):
+    assert parse_percentage(value) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("5 years", 5.0),
+    ("5+ yrs", 5.0),
+    ("3.5", 3.5),
+    (7, 7.0),
+    ("0", 0.0),
+    ("-3", None),
+    ("-3 years", None),
+    (-2, None),
+    ("N/A", None),
+    (None, None),
+    (False, None),
+])
+def test_parse_years(value, expected):
+    assert parse_years(value) == expected
+
+
+def test_screening_result_round_trip():
+    result = ScreeningResult.from_response({
+        "##JD Match": "85 %",
+        "##Missing Keywords": "Docker, Kubernetes",
+        "##Matching Keywords": ["Python", None, " "],
+        "##Profile Summary": "  Backend engineer.  ",
+        "##Years of Experience": "6+ years",
+    })
+    assert result == ScreeningResult(85.0, 6.0, ["Docker", "Kubernetes"], ["Python"], "Backend engineer.", [])
+    response = result.to_response()
+    assert response["##JD Match"] == "85%"
+    assert response["##Years of Experience"] == "6 years"
+    assert ScreeningResult.from_response(response) == result
+
+
+@pytest.mark.parametrize("response", [None, [], {}, {"##JD Match": "high"}, {"##JD Match": "150%"}])
+def test_screening_result_rejects_responses_without_a_valid_match(response):
+    assert ScreeningResult.from_response(response) is None
+
+
+def feed_in_chunks(scanner, text, size):
+    for end in range(size, len(text) + size, size):
+        if scanner.feed(text[:end]):
+            return True
+    return False
+
+
+def test_scanner_finds_value_around_prose_and_fences():
+    text = 'Sure! Here it is:\n```json\n{"a": {"b": [1, 2]}}\n```\nDone.'
+    scanner = JSONScanner()
+    assert scanner.value(text) == {"a": {"b": [1, 2]}}
+    assert text[scanner.end:].startswith("\n```")
+
+
+def test_scanner_ignores_brackets_and_quotes_inside_strings():
+    value = {"summary": 'uses {braces}, [brackets] and "quotes" \\ backslashes }'}
+    text = json.dumps(value) + " trailing"
+    assert JSONScanner().value(text) == value
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_scanner_handles_escapes_split_across_feeds(size):
+    text = '{"a": "x\\"}\\\\", "b": "\\\\"} tail'
+    scanner = JSONScanner()
+    assert feed_in_chunks(scanner, text, size)
+    assert json.loads(text[scanner.start:scanner.end]) == {"a": 'x"}\\', "b": "\\"}
+
+
+def test_scanner_escape_as_last_character_of_a_feed():
+    scanner = JSONScanner()
+    assert not scanner.feed('{"a": "\\')
+    assert scanner.escaped
+    assert not scanner.feed('{"a": "\\"')
+    assert scanner.feed('{"a": "\\""}')
+    assert scanner.value('{"a": "\\""}') == {"a": '"'}
+
+
+def test_scanner_waits_for_the_value_to_close():
+    scanner = JSONScanner()
+    assert not scanner.feed('{"a": [1, ')
+    assert scanner.value('{"a": [1, ') is None
+    assert scanner.feed('{"a": [1, 2]}')
+
+
+def test_scanner_array_openers():
+    text = 'Results: [{"resume_id": "R1"}, {"resume_id": "R2"}]'
+    assert JSONScanner("[{").value(text) == [{"resume_id": "R1"}, {"resume_id": "R2"}]
+    assert JSONScanner().value(text) == {"resume_id": "R1"}
+
+
+def test_scanner_invalid_json_gives_none():
+    assert JSONScanner().value("{'a': 1}") is None